@@ -0,0 +1,265 @@
+"""
+Benchmarks of the HyperGraph operations and REPL commands.
+
+    python benchmarks/bench.py [--quick] [--save-baseline] [--only NAME]
+
+Every operation runs on grids of increasing size, seeded random
+hypergraphs and the files in example_hgs/. Wall time (best of --repeat
+runs) and peak traced memory (one extra run under tracemalloc) are
+appended to the history file (--history, by default the untracked
+benchmarks/history.json), and compared against the baseline file if
+there is one. Exits with status 1 if an operation got slower or bigger
+than the baseline by more than --tolerance.
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hyperfun.hypergraph import HyperGraph, set_color  # noqa: E402
+from hyperfun.batch import _run_command  # noqa: E402
+from hyperfun.main import Prompt  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HISTORY = os.path.join(HERE, 'history.json')
+BASELINE = os.path.join(HERE, 'baseline.json')
+
+GRIDS = [(10, 10), (30, 30), (60, 60), (100, 100)]
+QUICK_GRIDS = [(10, 10), (30, 30)]
+# (vertices, edges, largest edge size)
+RANDOM = [(500, 1000, 5), (2000, 4000, 6), (10000, 20000, 8)]
+QUICK_RANDOM = [(500, 1000, 5)]
+SEED = 0
+
+# changes below these are noise, whatever the ratio
+MIN_SECONDS = 0.002
+MIN_BYTES = 64 * 1024
+# seconds from starting the interpreter to the first prompt, reported only
+STARTUP_TARGET = 0.1
+
+
+def random_hypergraph(n, m, k, seed=SEED):
+    """m edges of 2 to k vertices drawn uniformly from n vertices"""
+    rng = random.Random(seed)
+    h = HyperGraph()
+    vertices = ['v{}'.format(i) for i in range(n)]
+    for i in range(m):
+        h.add_edge(set(rng.sample(vertices, rng.randint(2, k))),
+                   'E{}'.format(i))
+    return h
+
+
+def inputs(quick):
+    """Yields (input name, hypergraph)"""
+    for n, m in QUICK_GRIDS if quick else GRIDS:
+        yield 'grid-{}x{}'.format(n, m), HyperGraph.grid(n, m)
+    for n, m, k in QUICK_RANDOM if quick else RANDOM:
+        yield 'random-{}-{}-{}'.format(n, m, k), random_hypergraph(n, m, k)
+    for path in sorted(glob.glob(os.path.join(ROOT, 'example_hgs', '*'))):
+        yield os.path.basename(path), HyperGraph.fromHyperbench(path)
+
+
+def _separator(hg):
+    """Vertices of a fixed random tenth of the edges"""
+    rng = random.Random(SEED)
+    names = sorted(hg.edge_dict)
+    sep = set()
+    for en in rng.sample(names, max(1, len(names) // 10)):
+        sep.update(hg.edge_dict[en])
+    return sep
+
+
+def operations(hg, path):
+    """
+    Yields (operation name, setup, run). setup() builds the arguments of
+    run on a fresh copy of hg, so that no cached result is reused, and is
+    not measured.
+    """
+    sep = _separator(hg)
+    largest = max(hg.separate(sep), key=lambda C: len(C.E))
+    U = set(largest.V)
+    x, y = sorted(hg.edge_dict[sorted(hg.edge_dict)[0]])[:2]
+
+    yield 'fromHyperbench', lambda: path, HyperGraph.fromHyperbench
+    yield 'separate', lambda: (hg.copy(), sep), lambda a: a[0].separate(a[1])
+    yield ('bridge_subg', lambda: (hg.copy(), U),
+           lambda a: a[0].bridge_subg(a[1]))
+    yield ('join_copy', lambda: hg.copy(),
+           lambda h: h.join_copy(x, y))
+    yield 'primal_nx', lambda: hg.copy(), lambda h: h.primal_nx()
+
+    def session():
+        with redirect_stdout(io.StringIO()):
+            return Prompt(path)
+    for op, cmd in (('repl:sep', 'sep ' + ' '.join(sorted(sep))),
+                    ('repl:show all', 'show all'),
+                    ('repl:state', 'state')):
+        yield op, session, lambda p, cmd=cmd: _run_command(p, cmd)
+
+
+def measure(setup, run, repeat):
+    """
+    (best wall time in seconds, peak traced memory in bytes). An untimed
+    first run does the one-time work, such as lazy imports, so that it
+    counts in neither; startup measures that cold path on its own.
+    """
+    run(setup())
+    best = None
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        run(args)
+        t = time.perf_counter() - start
+        best = t if best is None else min(best, t)
+    args = setup()
+    tracemalloc.start()
+    try:
+        run(args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def startup(repeat):
+    """
+    Best wall time of python -m hyperfun running an empty script, that is
+    interpreter start, imports and argument parsing
+    """
+    cmd = [sys.executable, '-m', 'hyperfun', '--script', '-']
+    best = None
+    for _ in range(max(repeat, 5)):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL, check=True)
+        t = time.perf_counter() - start
+        best = t if best is None else min(best, t)
+    return best
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              cwd=ROOT, stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL,
+                              universal_newlines=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(quick=False, repeat=3, only=None):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, hg in inputs(quick):
+            # every input is also loaded from a file, write it out once
+            path = os.path.join(tmp, name + '.hg')
+            with open(path, 'w') as f:
+                print(hg.toHyperbench(), file=f)
+            for op, setup, fn in operations(hg, path):
+                if only and op not in only:
+                    continue
+                seconds, peak = measure(setup, fn, repeat)
+                results.append({'input': name, 'op': op,
+                                'seconds': round(seconds, 6),
+                                'peak_bytes': peak})
+                print('{:<24} {:<16} {:>10.4f}s {:>10.1f}KiB'.format(
+                    name, op, seconds, peak / 1024), file=sys.stderr)
+    if not only or 'startup' in only:
+        seconds = startup(repeat)
+        # the memory of the child process is not traced
+        results.append({'input': 'python -m hyperfun', 'op': 'startup',
+                        'seconds': round(seconds, 6), 'peak_bytes': 0})
+        print('{:<24} {:<16} {:>10.4f}s (target {}s)'.format(
+            'python -m hyperfun', 'startup', seconds, STARTUP_TARGET),
+            file=sys.stderr)
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'quick': quick,
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Yields a description of every result worse than the baseline"""
+    base = {(r['input'], r['op']): r for r in baseline['results']}
+    for r in current['results']:
+        b = base.get((r['input'], r['op']))
+        if b is None:
+            continue
+        for key, floor in (('seconds', MIN_SECONDS),
+                           ('peak_bytes', MIN_BYTES)):
+            if (r[key] > b[key] * (1 + tolerance)
+                    and r[key] - b[key] > floor):
+                yield '{} {}: {} {} -> {} ({:+.0%})'.format(
+                    r['input'], r['op'], key, b[key], r[key],
+                    r[key] / b[key] - 1 if b[key] else float('inf'))
+
+
+def _load(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+def _dump(obj, path):
+    with open(path, 'w') as f:
+        json.dump(obj, f, indent=1)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--quick', action='store_true',
+                        help='only the small inputs')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='+', metavar='OP',
+                        help='only these operations')
+    parser.add_argument('--history', default=HISTORY)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative slowdown (default 0.25)')
+    args = parser.parse_args(argv)
+
+    set_color(False)
+    current = run(args.quick, args.repeat, args.only)
+    history = _load(args.history, [])
+    history.append(current)
+    _dump(history, args.history)
+
+    if args.save_baseline:
+        _dump(current, args.baseline)
+        print('Saved baseline {}'.format(args.baseline))
+        return 0
+    baseline = _load(args.baseline, None)
+    if baseline is None:
+        print('No baseline {}, run with --save-baseline'.format(args.baseline))
+        return 0
+    regressions = list(compare(current, baseline, args.tolerance))
+    for r in regressions:
+        print('REGRESSION', r)
+    if not regressions:
+        print('No regressions against baseline from {} ({})'.format(
+            baseline['time'], baseline['commit']))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+from .export import edge_order
+from .htd import Decomposition
+
+
+def join_tree(hg):
+    """
+    Join tree of hg as a width 1 Decomposition (bag and cover of every node
+    one edge) if hg is alpha-acyclic, None otherwise.
+
+    Maximum cardinality search (Tarjan and Yannakakis) picks the edge with
+    the most vertices of the edges picked before, from buckets of edges by
+    that count. hg is acyclic iff for every edge these old vertices lie
+    in the edge that introduced the last of them, which becomes its
+    parent. Linear in the total edge size. Edges picked with no old
+    vertex start a new tree; the trees are chained.
+    """
+    names = edge_order(hg)
+    edges = [hg.edges[en] for en in names]
+    index = {en: i for i, en in enumerate(names)}
+    inc = hg._incidence_index()
+    m = len(edges)
+
+    count = [0] * m
+    buckets = [set() for _ in range(max(map(len, edges), default=0) + 1)]
+    buckets[0].update(range(m))
+    top = 0
+    picked = [False] * m
+    introduced = dict()  # vertex id -> position of the edge that added it
+    as_set = dict()  # edge index -> vertex set, for the parents
+    order = []
+    parent = []
+    while len(order) < m:
+        while not buckets[top]:
+            top -= 1
+        i = buckets[top].pop()
+        picked[i] = True
+        pos = len(order)
+        order.append(i)
+        e = edges[i]
+        old = [v for v in e if v in introduced]
+        if old:
+            p = max(introduced[v] for v in old)
+            pi = order[p]
+            if pi not in as_set:
+                as_set[pi] = set(edges[pi])
+            if not as_set[pi].issuperset(old):
+                return None
+            parent.append(p)
+        else:
+            parent.append(None)
+        for v in e:
+            if v in introduced:
+                continue
+            introduced[v] = pos
+            for en in inc.get(v, ()):
+                f = index[en]
+                if not picked[f]:
+                    buckets[count[f]].discard(f)
+                    count[f] += 1
+                    buckets[count[f]].add(f)
+                    top = max(top, count[f])
+
+    number = hg.vertex_numbering()
+    d = Decomposition()
+    last_root = None
+    for pos, i in enumerate(order):
+        b = pos + 1
+        d.bags[b] = set(number[v] for v in edges[i])
+        d.cover[b] = {i + 1: 1}
+        if parent[pos] is not None:
+            d.tree.append((parent[pos] + 1, b))
+        else:
+            if last_root is not None:
+                d.tree.append((last_root, b))
+            last_root = b
+    d.declared = (len(d.bags), d.width(), len(number), m)
+    return d
+
+
+def gyo_core(hg):
+    """
+    What remains of hg after GYO reduction: vertices in a single edge are
+    deleted and edges contained in another edge removed, until neither
+    applies. Empty exactly when hg is acyclic. Only an edge that lost
+    vertices can become contained in another, and only vertices of a
+    removed edge can drop to a single edge, so both are rechecked from
+    worklists.
+    """
+    edges = {en: set(e) for en, e in hg.edges.items()}
+    inc = {v: set(ens) for v, ens in hg._incidence_index().items()}
+    check_edges = list(edges)
+    check_vertices = list(inc)
+    while check_edges or check_vertices:
+        while check_vertices:
+            v = check_vertices.pop()
+            ens = inc.get(v)
+            if ens is not None and len(ens) <= 1:
+                del inc[v]
+                for en in ens:
+                    edges[en].discard(v)
+                    check_edges.append(en)
+        while check_edges:
+            en = check_edges.pop()
+            e = edges.get(en)
+            if e is None:
+                continue
+            if e:
+                rare = min(e, key=lambda v: len(inc[v]))
+                contained = any(edges[f].issuperset(e)
+                                for f in inc[rare] if f != en)
+            else:
+                contained = len(edges) > 1
+            if contained:
+                del edges[en]
+                for v in e:
+                    inc[v].discard(en)
+                    check_vertices.append(v)
+    core = hg._derived()
+    for en in sorted(edges):
+        if edges[en]:
+            core._add_ids(tuple(sorted(edges[en])), en)
+    return core
@@ -0,0 +1,163 @@
+from .hypergraph import component_edges, component_labels
+
+
+def candidate_edges(hg):
+    """
+    Edge names worth trying in a separator: one edge per distinct vertex set
+    and no edge that is a proper subset of another edge, because removing
+    more vertices never makes a separation less balanced. Larger edges come
+    first, they tend to split more.
+    """
+    edges = hg.edges
+    inc = hg._incidence_index()
+    distinct = dict()
+    for en, e in edges.items():
+        if e and e not in distinct:
+            distinct[e] = en
+    keep = []
+    for e, en in distinct.items():
+        rare = min(e, key=lambda v: len(inc[v]))
+        se = set(e)
+        if any(len(edges[f]) > len(e) and se.issubset(edges[f])
+               for f in inc[rare]):
+            continue
+        keep.append(en)
+    keep.sort(key=lambda en: (-len(edges[en]), en))
+    return keep
+
+
+def _split(edges, names, sep, bound=None):
+    """
+    Components of the edges in names after removing the vertex ids in sep,
+    as lists of edge names. Returns None as soon as a component has more
+    than bound edges.
+    """
+    parent = dict()
+    count = dict()
+
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    first = []
+    for en in names:
+        r = None
+        for v in edges[en]:
+            if v in sep:
+                continue
+            if v not in parent:
+                parent[v] = v
+                count[v] = 0
+                rv = v
+            else:
+                rv = find(v)
+            if r is None:
+                r = rv
+            elif rv != r:
+                if count[rv] > count[r]:
+                    r, rv = rv, r
+                parent[rv] = r
+                count[r] += count[rv]
+        if r is None:
+            continue  # inside the separator
+        count[r] += 1
+        if bound is not None and count[r] > bound:
+            return None
+        first.append((en, r))
+
+    comps = dict()
+    for en, r in first:
+        comps.setdefault(find(r), []).append(en)
+    return list(comps.values())
+
+
+def _bfs_order(hg, names, sep):
+    """
+    The edge names of a connected component in breadth-first order, so that
+    _split grows one part steadily and aborts early when it is too big.
+    """
+    inc = hg._incidence_index()
+    inside = set(names)
+    order = [names[0]]
+    inside.discard(names[0])
+    for en in order:
+        for v in hg.edges[en]:
+            if v in sep:
+                continue
+            for g in inc[v]:
+                if g in inside:
+                    inside.discard(g)
+                    order.append(g)
+    return order + list(inside)
+
+
+def component_sizes(hg, sep):
+    """Edge counts of the components of hg without the vertex ids in sep"""
+    labels = component_labels(hg.edges, hg.vids, sep)
+    sizes = [len(c) for c in component_edges(hg.edges, labels, sep)]
+    return sorted((s for s in sizes if s > 0), reverse=True)
+
+
+def balanced_separators(hg, k):
+    """
+    Yields (edge_names, component_sizes) for the separators that are unions
+    of at most k edges of hg and leave no component with more than half of
+    the edges of hg.
+
+    Edges are combined in a fixed order (symmetry), duplicate and subsumed
+    edges are never used (see candidate_edges), and a vertex set is only
+    searched again if it is reached with more edges left to add or with
+    more candidates after its last edge; every vertex set is yielded once.
+    If a separator leaves a component B that is too big, only edges
+    meeting B can help, and the components of the next candidate
+    are computed by splitting B alone; all other components are small
+    already and only get smaller. At the last level the split is aborted
+    as soon as one part exceeds half the edges. Balanced separators are
+    not extended further.
+    """
+    edges = hg.edges
+    half = len(edges) / 2
+    cands = candidate_edges(hg)
+    rank = {en: i for i, en in enumerate(cands)}
+    visits = dict()  # vertex set -> [(edges in it, rank of the last)]
+
+    def search(chosen, sep, big):
+        last = rank[chosen[-1]] if chosen else -1
+        verts = set()
+        for en in big:
+            verts.update(edges[en])
+        verts.difference_update(sep)
+        nexts = [en for en in hg._touching_ids(verts)
+                 if rank.get(en, -1) > last]
+        nexts.sort(key=rank.__getitem__)
+        depth = len(chosen) + 1
+        final = depth == k
+        for en in nexts:
+            sep2 = sep.union(edges[en])
+            # an earlier search from sep2 with at least as many edges left
+            # and candidates covers everything this one would find
+            before = visits.setdefault(sep2, [])
+            if any(d <= depth and r <= rank[en] for d, r in before):
+                continue
+            before.append((depth, rank[en]))
+            comps = _split(edges, big, sep2, half if final else None)
+            if comps is None:
+                continue
+            largest = max(comps, key=len, default=[])
+            if len(largest) <= half:
+                if len(before) == 1:
+                    yield chosen + (en,), component_sizes(hg, sep2)
+            elif not final:
+                yield from search(chosen + (en,), sep2,
+                                  _bfs_order(hg, largest, sep2))
+
+    start = [c for c in component_edges(edges, hg._labels(frozenset()),
+                                        frozenset())
+             if len(c) > half]
+    if not start:
+        yield (), component_sizes(hg, frozenset())
+    elif k > 0:
+        yield from search((), frozenset(),
+                          _bfs_order(hg, start[0], frozenset()))
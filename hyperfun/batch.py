@@ -0,0 +1,78 @@
+import io
+import json
+import sys
+import time
+from contextlib import redirect_stdout
+from .hypergraph import set_color
+from .main import Prompt
+
+
+def _run_command(prompt, line):
+    """Runs one REPL command, returns (output, error, stop)"""
+    out = io.StringIO()
+    error = None
+    stop = False
+    prompt.stdout = out  # cmd writes help and unknown command errors here
+    with redirect_stdout(out):
+        try:
+            line = prompt.precmd(line)
+            stop = prompt.postcmd(prompt.onecmd(line), line)
+        except SystemExit:
+            stop = True
+        except Exception as e:
+            error = '{}: {}'.format(type(e).__name__, e)
+    if error is None:
+        error = prompt.error  # commands report failures with Prompt.fail
+    return out.getvalue(), error, stop
+
+
+def run_file(commands, path, out):
+    """
+    Runs the commands against a fresh session with path loaded (if not
+    None) and writes one JSON record per command to out. Returns the
+    number of failed commands.
+    """
+    prompt = Prompt()
+    failed = 0
+    records = []
+    if path is not None:
+        records.append('load ' + path)
+    records.extend(commands)
+    for lineno, line in enumerate(records, start=0 if path else 1):
+        start = time.perf_counter()
+        output, error, stop = _run_command(prompt, line)
+        hg = prompt.state.hg
+        record = {
+            'file': path,
+            'line': lineno,
+            'command': line,
+            'ok': error is None,
+            'error': error,
+            'seconds': round(time.perf_counter() - start, 6),
+            'component': prompt.state.current_component,
+            'vertices': None if hg is None else len(hg.V),
+            'edges': None if hg is None else len(hg.E),
+            'output': output,
+        }
+        out.write(json.dumps(record) + '\n')
+        if error is not None:
+            failed += 1
+        if stop:
+            break
+    return failed
+
+
+def run_script(lines, paths, out=sys.stdout):
+    """
+    Runs a command script against each path in turn, without colors or
+    a terminal. Line 0 of a file's records is its load command. Returns
+    an exit status: 1 if any command failed.
+    """
+    set_color(False)
+    commands = [l.strip() for l in lines]
+    commands = [c for c in commands if c and not c.startswith('#')]
+    failed = 0
+    for path in paths:
+        failed += run_file(commands, path, out)
+        out.flush()
+    return 1 if failed else 0
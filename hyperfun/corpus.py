@@ -0,0 +1,277 @@
+"""
+Runs a pipeline over a corpus of hypergraph files, one process per file:
+
+    python -m hyperfun.corpus example_hgs -o results.jsonl --reduce --balsep 2
+
+Every file is loaded, optionally reduced, tested for acyclicity,
+searched for a balanced separator unless it is acyclic, and exported.
+One record per file is appended to the output (JSONL, or CSV for a .csv
+path) as soon as it is done; files that already have a record there are
+skipped, so an interrupted run resumes.
+"""
+import argparse
+import collections
+import csv
+import glob
+import itertools
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+from .balsep import balanced_separators
+from .export import FORMATS
+from .main import EXPORT_BUFFER, read_hypergraph
+from .reduce import reduce_hypergraph
+from .snapshot import write_snapshot
+
+EXTENSIONS = ('.hg', '.dtl')  # files taken from a corpus directory
+TIMEOUT = 60.0  # seconds per file
+SUFFIXES = {
+    'hyperbench': '.hg',
+    'pace': '.hgr',
+    'sc': '.sc',
+    'gr': '.gr',
+    'csv': '.csv',
+    'mtx': '.mtx',
+    'bin': '.snap',
+}
+# CSV columns, lists are written space separated
+FIELDS = ('file', 'ok', 'error', 'seconds', 'vertices', 'edges',
+          'reduced_vertices', 'reduced_edges', 'removed_edges',
+          'collapsed_vertices', 'acyclic', 'separator', 'components',
+          'exports')
+
+
+def corpus_files(specs):
+    """
+    Files named by specs, each a directory (searched recursively for
+    EXTENSIONS), a glob pattern or a file, in sorted order without
+    repetitions
+    """
+    files = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            for root, dirs, names in os.walk(spec):
+                dirs.sort()
+                files.extend(os.path.join(root, n) for n in sorted(names)
+                             if n.endswith(EXTENSIONS))
+        elif os.path.exists(spec):
+            files.append(spec)
+        else:
+            files.extend(sorted(glob.glob(spec, recursive=True)))
+    return list(dict.fromkeys(files))
+
+
+def export_path(path, export_dir, fmt, base=None):
+    """Where path is exported in fmt, mirroring its place below base"""
+    rel = os.path.relpath(path, base) if base else os.path.basename(path)
+    return os.path.join(export_dir,
+                        os.path.splitext(rel)[0] + SUFFIXES[fmt])
+
+
+def process_file(path, reduce=False, balsep=None, export=(),
+                 export_dir=None, base=None):
+    """The pipeline for one file, returns its record"""
+    record = {'file': path, 'ok': True}
+    hg = read_hypergraph(path)
+    record['vertices'] = len(hg.vids)
+    record['edges'] = len(hg.edges)
+    if reduce:
+        hg, reduction = reduce_hypergraph(hg)
+        record['reduced_vertices'] = len(hg.vids)
+        record['reduced_edges'] = len(hg.edges)
+        record['removed_edges'] = reduction.duplicates() + reduction.subsumed()
+        record['collapsed_vertices'] = reduction.collapsed()
+    # acyclic hypergraphs have width 1, no separator needed
+    record['acyclic'] = hg.is_acyclic()
+    if balsep is not None and not record['acyclic']:
+        found = next(balanced_separators(hg, balsep), None)
+        if found is not None:
+            record['separator'], record['components'] = found
+    exports = []
+    for fmt in export:
+        out = export_path(path, export_dir, fmt, base)
+        os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+        if fmt == 'bin':
+            write_snapshot(hg, out)
+        else:
+            with open(out, 'w', buffering=EXPORT_BUFFER) as f:
+                FORMATS[fmt](hg, f)
+        exports.append(out)
+    if export:
+        record['exports'] = exports
+    return record
+
+
+def _worker(conn, path, options):
+    try:
+        record = process_file(path, **options)
+    except Exception as e:
+        record = {'file': path, 'ok': False,
+                  'error': '{}: {}'.format(type(e).__name__, e)}
+    conn.send(record)
+    conn.close()
+
+
+def run_corpus(paths, options, jobs=None, timeout=TIMEOUT):
+    """
+    Yields the record of every path in completion order, running
+    process_file(path, **options) in a process of its own with at most
+    jobs (default all CPUs) at a time. A process still running after
+    timeout seconds is killed and gets a failed record.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    pending = collections.deque(paths)
+    running = dict()  # connection -> (process, path, start)
+
+    def finish(conn, record):
+        process, path, start = running.pop(conn)
+        conn.close()
+        process.join()
+        record.setdefault('ok', False)
+        record['seconds'] = round(time.perf_counter() - start, 6)
+        return record
+
+    try:
+        while pending or running:
+            while pending and len(running) < jobs:
+                path = pending.popleft()
+                recv, send = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(
+                    target=_worker, args=(send, path, options), daemon=True)
+                process.start()
+                send.close()
+                running[recv] = (process, path, time.perf_counter())
+            first = min(start for _, _, start in running.values())
+            wait = max(first + timeout - time.perf_counter(), 0)
+            for conn in multiprocessing.connection.wait(list(running), wait):
+                try:
+                    record = conn.recv()
+                except EOFError:
+                    process, path, _ = running[conn]
+                    process.join()
+                    record = {'file': path, 'error': 'worker exited with '
+                              'code {}'.format(process.exitcode)}
+                yield finish(conn, record)
+            now = time.perf_counter()
+            for conn, (process, path, start) in list(running.items()):
+                if now - start > timeout:
+                    process.kill()
+                    yield finish(conn, {'file': path, 'error': 'timeout after '
+                                        '{:g}s'.format(timeout)})
+    finally:
+        for process, _, _ in running.values():
+            process.kill()
+            process.join()
+
+
+def _cut_partial_line(path):
+    """Drops an incomplete last line left by an interrupted run"""
+    with open(path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+
+
+def read_records(path):
+    """Records of an earlier run written to path, JSONL or CSV"""
+    if not os.path.exists(path):
+        return []
+    _cut_partial_line(path)
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            return [dict(r, ok=r['ok'] == 'True') for r in csv.DictReader(f)]
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class RecordWriter(object):
+    """Appends records to f as JSON lines, or as CSV rows of FIELDS"""
+
+    def __init__(self, f, as_csv=False):
+        self.f = f
+        self.csv = None
+        if as_csv:
+            self.csv = csv.DictWriter(f, FIELDS, lineterminator='\n')
+            if f.tell() == 0:
+                self.csv.writeheader()
+
+    def write(self, record):
+        if self.csv is None:
+            self.f.write(json.dumps(record) + '\n')
+        else:
+            self.csv.writerow({k: ' '.join(map(str, v))
+                               if isinstance(v, (list, tuple)) else v
+                               for k, v in record.items()})
+        self.f.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='hyperfun-corpus',
+        description='Run a pipeline over a corpus of hypergraph files')
+    parser.add_argument('inputs', nargs='+', metavar='INPUT',
+                        help='directory, glob pattern or file')
+    parser.add_argument('-o', '--output', metavar='FILE',
+                        help='append records to FILE (.csv for CSV, JSONL '
+                             'otherwise) and skip files recorded there; '
+                             'JSONL to stdout by default')
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='processes at a time (default all CPUs)')
+    parser.add_argument('-t', '--timeout', type=float, default=TIMEOUT,
+                        help='seconds per file (default {:g})'.format(TIMEOUT))
+    parser.add_argument('--reduce', action='store_true',
+                        help='remove duplicate and subsumed edges first')
+    parser.add_argument('--balsep', type=int, metavar='K',
+                        help='search a balanced separator of at most K edges')
+    parser.add_argument('--export', nargs='+', default=[], metavar='FORMAT',
+                        choices=sorted(SUFFIXES),
+                        help='formats to export to --export-dir')
+    parser.add_argument('--export-dir', default='.', metavar='DIR')
+    parser.add_argument('--retry', action='store_true',
+                        help='run files with a failed record again')
+    args = parser.parse_args(argv)
+
+    paths = corpus_files(args.inputs)
+    done = set()
+    if args.output is not None:
+        done = set(r['file'] for r in read_records(args.output)
+                   if r['ok'] or not args.retry)
+    todo = [p for p in paths if p not in done]
+    if len(todo) < len(paths):
+        print('Skipping {} files recorded in {}'.format(
+            len(paths) - len(todo), args.output), file=sys.stderr)
+    dirs = [os.path.dirname(os.path.abspath(p)) for p in paths]
+    options = {
+        'reduce': args.reduce,
+        'balsep': args.balsep,
+        'export': args.export,
+        'export_dir': args.export_dir,
+        'base': os.path.relpath(os.path.commonpath(dirs)) if dirs else None,
+    }
+
+    out = sys.stdout if args.output is None else open(args.output, 'a',
+                                                      newline='')
+    writer = RecordWriter(out, (args.output or '').endswith('.csv'))
+    failed = 0
+    try:
+        records = run_corpus(todo, options, args.jobs, args.timeout)
+        for i, record in zip(itertools.count(1), records):
+            writer.write(record)
+            failed += not record['ok']
+            print('[{}/{}] {} {} {:.2f}s'.format(
+                i, len(todo), record['file'],
+                'ok' if record['ok'] else record['error'],
+                record['seconds']), file=sys.stderr)
+    except KeyboardInterrupt:
+        print('Interrupted, run again to resume', file=sys.stderr)
+        return 130
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import heapq
+import itertools
+import time
+from .balsep import candidate_edges
+from .hypergraph import component_edges, component_labels
+
+PROGRESS_INTERVAL = 1.0  # seconds between progress reports
+
+# hypergraph of the worker process, set once by _init_worker
+_worker_edges = None
+_worker_vertices = None
+
+
+def _init_worker(edges, vertices):
+    global _worker_edges, _worker_vertices
+    _worker_edges = edges
+    _worker_vertices = vertices
+
+
+def _evaluate(task):
+    label, sep = task
+    sep = frozenset(sep)
+    labels = component_labels(_worker_edges, _worker_vertices, sep)
+    sizes = [len(c) for c in component_edges(_worker_edges, labels, sep)]
+    sizes = [s for s in sizes if s > 0]
+    largest = max(sizes, default=0)
+    balanced = largest <= len(_worker_edges) / 2
+    return label, len(sep), len(sizes), largest, balanced
+
+
+def edge_pairs(hg):
+    """Every pair of edges that are not duplicates or subsumed"""
+    for a, b in itertools.combinations(candidate_edges(hg), 2):
+        yield '{} {}'.format(a, b), set(hg.edges[a]).union(hg.edges[b])
+
+
+def neighbourhoods(hg):
+    """Closed neighbourhood of every vertex"""
+    inc = hg._incidence_index()
+    for v in sorted(hg.vids):
+        nb = {v}
+        for en in inc.get(v, ()):
+            nb.update(hg.edges[en])
+        yield 'N[{}]'.format(hg.vt.names[v]), nb
+
+
+def separator_file(hg, path):
+    """One separator per line, given as vertex names"""
+    with open(path) as f:
+        for line in f:
+            names = line.replace(',', ' ').split()
+            if names:
+                yield ' '.join(names), hg.vt.lookup(names)
+
+
+def evaluate_separators(hg, candidates, processes=None, chunksize=64):
+    """
+    Yields (label, separator_size, components, largest_component, balanced)
+    for every (label, vertex id set) in candidates, in completion order.
+    The candidates are spread over a pool of processes; every worker
+    receives the hypergraph once when it starts.
+    """
+    edges = dict(hg.edges.items())
+    vertices = set(hg.vids)
+    tasks = ((label, tuple(sep)) for label, sep in candidates)
+    if processes == 1:
+        _init_worker(edges, vertices)
+        yield from map(_evaluate, tasks)
+        return
+    import multiprocessing
+    with multiprocessing.Pool(processes, initializer=_init_worker,
+                              initargs=(edges, vertices)) as pool:
+        yield from pool.imap_unordered(_evaluate, tasks, chunksize)
+
+
+def rank_key(result):
+    """Balanced first, then smaller largest component, more components
+    and smaller separators"""
+    label, sep_size, components, largest, balanced = result
+    return (not balanced, largest, -components, sep_size, label)
+
+
+def top_separators(results, n, progress=None, interval=PROGRESS_INTERVAL):
+    """
+    The n best results by rank_key and the number of results seen. While
+    the results arrive, progress(seen, best result so far) is called at
+    most every interval seconds.
+    """
+    seen = [0]
+
+    def counting():
+        best = None
+        last = time.perf_counter()
+        for r in results:
+            seen[0] += 1
+            if best is None or rank_key(r) < rank_key(best):
+                best = r
+            if progress is not None and (
+                    time.perf_counter() - last >= interval):
+                progress(seen[0], best)
+                last = time.perf_counter()
+            yield r
+    best = heapq.nsmallest(n, counting(), key=rank_key)
+    return best, seen[0]
@@ -0,0 +1,136 @@
+import csv
+import itertools
+
+# lines formatted before one write call on the output file
+CHUNK_LINES = 4096
+
+
+def _write_lines(f, lines):
+    """Writes the iterable of lines to f, CHUNK_LINES lines per write"""
+    lines = iter(lines)
+    while True:
+        chunk = list(itertools.islice(lines, CHUNK_LINES))
+        if not chunk:
+            return
+        chunk.append('')
+        f.write('\n'.join(chunk))
+
+
+def edge_order(hg):
+    """Edge names in the order numbered exports number them, from 1"""
+    return sorted(hg.edges)
+
+
+def _sorted_edges(hg):
+    edges = hg.edges
+    return ((en, edges[en]) for en in edge_order(hg))
+
+
+def write_hyperbench(hg, f):
+    names = hg.vt.names
+    _write_lines(f, ('{}({}),'.format(en, ','.join(names[v] for v in e))
+                     for en, e in _sorted_edges(hg)))
+
+
+def write_pace(hg, f, special=()):
+    """
+    PACE 2019 hypertree decomposition input. Vertices are numbered by
+    hg.vertex_numbering(), edges in name order. special is an iterable of
+    vertex name collections written as s lines.
+    """
+    num = hg.vertex_numbering()
+
+    def lines():
+        yield 'p htd {} {}'.format(len(num), len(hg.edges))
+        for i, (en, e) in enumerate(_sorted_edges(hg), start=1):
+            yield '{} {}'.format(i, ' '.join(str(num[v]) for v in e))
+        for sp in special or ():
+            if sp is None:
+                continue
+            sp = sorted(num[v] for v in hg.vt.lookup(sp))
+            yield 's ' + ' '.join(map(str, sp))
+    _write_lines(f, lines())
+
+
+def write_visualsc(hg, f):
+    """All edges on one line as sets of vertex numbers"""
+    num = hg.vertex_numbering()
+    sets = ('{' + ', '.join(str(num[v]) for v in e) + '}'
+            for en, e in _sorted_edges(hg))
+    sep = ''
+    while True:
+        chunk = list(itertools.islice(sets, CHUNK_LINES))
+        if not chunk:
+            break
+        f.write(sep + ' '.join(chunk))
+        sep = ' '
+    f.write('\n')
+
+
+def _primal_neighbours(hg, num):
+    """Yields (u, larger neighbours of u) by vertex number, one at a time"""
+    inc = hg._incidence_index()
+    edges = hg.edges
+    for v in sorted(num, key=num.__getitem__):
+        u = num[v]
+        nb = set()
+        for en in inc.get(v, ()):
+            nb.update(num[w] for w in edges[en])
+        yield u, sorted(w for w in nb if w > u)
+
+
+def write_gr(hg, f):
+    """
+    Primal graph in the PACE treewidth .gr format. The header needs the
+    number of primal edges, so the neighbourhoods are computed twice
+    instead of keeping the whole primal graph in memory.
+    """
+    num = hg.vertex_numbering()
+    m = sum(len(nb) for u, nb in _primal_neighbours(hg, num))
+
+    def lines():
+        yield 'p tw {} {}'.format(len(num), m)
+        for u, nb in _primal_neighbours(hg, num):
+            for w in nb:
+                yield '{} {}'.format(u, w)
+    _write_lines(f, lines())
+
+
+def write_incidence_csv(hg, f):
+    """Incidence matrix as one edge,vertex row per nonzero entry"""
+    names = hg.vt.names
+    w = csv.writer(f, lineterminator='\n')
+    w.writerow(('edge', 'vertex'))
+    rows = ((en, names[v]) for en, e in _sorted_edges(hg) for v in e)
+    while True:
+        chunk = list(itertools.islice(rows, CHUNK_LINES))
+        if not chunk:
+            return
+        w.writerows(chunk)
+
+
+def write_mtx(hg, f):
+    """
+    Incidence matrix in Matrix Market coordinate format: row i is the i-th
+    edge in name order, column j the vertex numbered j.
+    """
+    num = hg.vertex_numbering()
+    nnz = sum(len(e) for e in hg.edges.values())
+
+    def lines():
+        yield '%%MatrixMarket matrix coordinate pattern general'
+        yield '{} {} {}'.format(len(hg.edges), len(num), nnz)
+        for i, (en, e) in enumerate(_sorted_edges(hg), start=1):
+            for j in sorted(num[v] for v in e):
+                yield '{} {}'.format(i, j)
+    _write_lines(f, lines())
+
+
+FORMATS = {
+    'hyperbench': write_hyperbench,
+    'pace': write_pace,
+    'sc': write_visualsc,
+    'gr': write_gr,
+    'csv': write_incidence_csv,
+    'mtx': write_mtx,
+}
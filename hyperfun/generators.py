@@ -0,0 +1,163 @@
+from array import array
+from .hypergraph import HyperGraph
+
+try:
+    import numpy as np
+except ImportError:  # only the generators need numpy
+    np = None
+
+# rounds of redrawing edges with repeated vertices before falling back
+# to drawing them one by one
+_REDRAW_ROUNDS = 32
+
+
+def _rng(seed):
+    if np is None:
+        raise RuntimeError('The generators require numpy')
+    return np.random.default_rng(seed)
+
+
+def _to_array(a):
+    out = array('q')
+    out.frombytes(np.ascontiguousarray(a, dtype=np.int64).tobytes())
+    return out
+
+
+def _numbered(prefix):
+    return lambda used: ['{}{}'.format(prefix, v) for v in used.tolist()]
+
+
+def _build(n, indptr, indices, vertex_names):
+    """
+    HyperGraph from a CSR layout over global vertex numbers below n with
+    sorted rows. Vertices in no edge are dropped, the rest are renumbered
+    compactly and named by vertex_names(array of their global numbers).
+    """
+    mask = np.zeros(n, dtype=bool)
+    mask[indices] = True
+    used = np.flatnonzero(mask)
+    indices = (np.cumsum(mask) - 1)[indices]
+    names = vertex_names(used)
+    edge_names = _numbered('E')(np.arange(len(indptr) - 1))
+    return HyperGraph.fromCSR(names, edge_names, _to_array(indptr),
+                              _to_array(indices))
+
+
+def _rows(rows):
+    """CSR layout of an (m, k) array of sorted rows"""
+    m, k = rows.shape
+    return np.arange(0, m * k + 1, k, dtype=np.int64), rows.ravel()
+
+
+def _distinct_rows(rng, m, k, high):
+    """(m, k) array, every row k sorted distinct integers below high"""
+    if k > high:
+        raise ValueError('Cannot choose {} distinct vertices from {}'.format(
+            k, high))
+    rows = np.sort(rng.integers(0, high, size=(m, k)), axis=1)
+    for _ in range(_REDRAW_ROUNDS):
+        bad = np.flatnonzero((np.diff(rows, axis=1) == 0).any(axis=1))
+        if len(bad) == 0:
+            return rows
+        rows[bad] = np.sort(rng.integers(0, high, size=(len(bad), k)), axis=1)
+    for i in bad:
+        rows[i] = np.sort(rng.choice(high, k, replace=False))
+    return rows
+
+
+def uniform(n, m, k, seed=0):
+    """m edges of k distinct vertices each, uniformly from n vertices"""
+    rng = _rng(seed)
+    indptr, indices = _rows(_distinct_rows(rng, m, k, n))
+    return _build(n, indptr, indices, _numbered('v'))
+
+
+def power_law(n, m, k, exponent=2.5, seed=0):
+    """
+    m edges of k vertex draws each, vertex i drawn with probability
+    proportional to (i + 1) ** (-1 / (exponent - 1)), so that the degrees
+    follow a power law with the given exponent (Chung-Lu). Repeated draws
+    within an edge are merged, hub edges can be smaller than k.
+    """
+    if exponent <= 1:
+        raise ValueError('The exponent must be larger than 1')
+    rng = _rng(seed)
+    weights = np.arange(1, n + 1, dtype=np.float64) ** (-1 / (exponent - 1))
+    rows = np.sort(rng.choice(n, size=(m, k), p=weights / weights.sum()),
+                   axis=1)
+    keep = np.ones(rows.shape, dtype=bool)
+    keep[:, 1:] = np.diff(rows, axis=1) != 0
+    indptr = np.zeros(m + 1, dtype=np.int64)
+    np.cumsum(keep.sum(axis=1), out=indptr[1:])
+    return _build(n, indptr, rows[keep], _numbered('v'))
+
+
+def hypergrid(shape, k=2, torus=False):
+    """
+    Grid with the given side lengths in any dimension. Every run of k
+    consecutive vertices along an axis is an edge, k=2 gives the usual
+    grid graph. On a torus the runs wrap around. Vertices are named by
+    their coordinates, e.g. 3.0.7.
+    """
+    if np is None:
+        raise RuntimeError('The generators require numpy')
+    shape = tuple(shape)
+    if k < 2 or any(k > n for n in shape):
+        raise ValueError('Edge size must be between 2 and the side lengths')
+    if torus and any(k == n for n in shape):
+        raise ValueError('Sides of a torus must be longer than the edges')
+    coords = np.indices(shape).reshape(len(shape), -1)
+    rows = []
+    for axis, n in enumerate(shape):
+        starts = coords if torus else coords[:, coords[axis] <= n - k]
+        run = []
+        for t in range(k):
+            c = starts.copy()
+            c[axis] = (c[axis] + t) % n
+            run.append(np.ravel_multi_index(c, shape))
+        rows.append(np.sort(np.stack(run, axis=1), axis=1))
+    indptr, indices = _rows(np.concatenate(rows))
+
+    def names(used):
+        axes = [c.tolist() for c in np.unravel_index(used, shape)]
+        return ['.'.join(map(str, c)) for c in zip(*axes)]
+    return _build(coords.shape[1], indptr, indices, names)
+
+
+def planted(n, m, k, parts=2, sep_size=None, seed=0):
+    """
+    Hypergraph with a planted balanced separator: sep_size vertices s0, s1,
+    ... and parts blocks of the remaining vertices p0.0, p0.1, ..., p1.0,
+    ... Every edge draws k distinct vertices from one block and the
+    separator. The first parts edges go to distinct blocks and contain a
+    vertex of it, the others to random blocks, so removing the s vertices
+    leaves at least min(parts, m) components.
+    """
+    if sep_size is None:
+        sep_size = max(1, n // 100)
+    block = (n - sep_size) // parts
+    if block < 1:
+        raise ValueError('Not enough vertices for {} blocks'.format(parts))
+    rng = _rng(seed)
+    # local number j of an edge in block b: vertex b * block + j inside
+    # the block, separator vertex j - block afterwards
+    local = _distinct_rows(rng, m, k, block + sep_size)
+    blocks = rng.integers(0, parts, size=(m, 1))
+    first = min(parts, m)
+    blocks[:first, 0] = np.arange(first)
+    outside = local[:first].min(axis=1) >= block
+    local[:first][outside, 0] = rng.integers(0, block, size=outside.sum())
+    rows = np.where(local < block, local + blocks * block + sep_size,
+                    local - block)
+    rows.sort(axis=1)
+    indptr, indices = _rows(rows)
+
+    def names(used):
+        return ['s{}'.format(v) if v < sep_size
+                else 'p{}.{}'.format(*divmod(v - sep_size, block))
+                for v in used.tolist()]
+    return _build(sep_size + parts * block, indptr, indices, names)
+
+
+def torus(shape, k=2):
+    return hypergrid(shape, k, torus=True)
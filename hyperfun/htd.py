@@ -0,0 +1,275 @@
+from .export import _write_lines, edge_order
+
+# violations listed per check, the rest are only counted
+SHOW_VIOLATIONS = 5
+EPSILON = 1e-9
+
+
+class HtdSyntaxError(ValueError):
+    def __init__(self, msg, source, line):
+        super(HtdSyntaxError, self).__init__(
+            '{}:{}: {}'.format(source, line, msg))
+        self.source = source
+        self.line = line
+
+
+class Decomposition(object):
+    """
+    A PACE 2019 hypertree decomposition: bags of vertex numbers, tree edges
+    between bag ids and the weight of every edge number in the cover of a
+    bag. Vertices and edges are numbered like write_pace numbers them.
+    """
+
+    def __init__(self):
+        self.declared = None  # (bags, width, vertices, edges) of the s line
+        self.bags = dict()
+        self.tree = []
+        self.cover = dict()
+
+    def width(self):
+        return max((sum(c.values()) for c in self.cover.values()), default=0)
+
+
+def read_htd(path):
+    d = Decomposition()
+    with open(path) as f:
+        for lineno, line in enumerate(f, start=1):
+            parts = line.split()
+            if not parts or parts[0] == 'c':
+                continue
+            try:
+                if parts[0] == 's':
+                    if len(parts) != 6 or parts[1] != 'htd':
+                        raise ValueError('expected s htd <bags> <width> '
+                                         '<vertices> <edges>')
+                    if d.declared is not None:
+                        raise ValueError('second s line')
+                    d.declared = (int(parts[2]), float(parts[3]),
+                                  int(parts[4]), int(parts[5]))
+                elif parts[0] == 'b':
+                    if len(parts) < 2:
+                        raise ValueError('bag line without bag id')
+                    b = int(parts[1])
+                    if b in d.bags:
+                        raise ValueError('bag {} given twice'.format(b))
+                    d.bags[b] = set(map(int, parts[2:]))
+                elif parts[0] == 'w':
+                    if len(parts) != 4:
+                        raise ValueError('expected w <bag> <edge> <weight>')
+                    w = float(parts[3])
+                    if w < 0:
+                        raise ValueError('negative weight')
+                    if w > 0:
+                        c = d.cover.setdefault(int(parts[1]), dict())
+                        c[int(parts[2])] = c.get(int(parts[2]), 0) + w
+                elif len(parts) == 2:
+                    d.tree.append((int(parts[0]), int(parts[1])))
+                else:
+                    raise ValueError('unknown line')
+            except ValueError as e:
+                raise HtdSyntaxError(str(e), path, lineno)
+    if d.declared is None:
+        raise HtdSyntaxError('missing s line', path, 0)
+    return d
+
+
+def write_htd(d, f):
+    def lines():
+        n_bags, width, n_vertices, n_edges = d.declared
+        yield 's htd {} {} {} {}'.format(n_bags, _number(width), n_vertices,
+                                         n_edges)
+        for b, bag in sorted(d.bags.items()):
+            yield ' '.join(map(str, ['b', b] + sorted(bag)))
+        for a, b in d.tree:
+            yield '{} {}'.format(a, b)
+        for b, c in sorted(d.cover.items()):
+            for e, w in sorted(c.items()):
+                yield 'w {} {} {}'.format(b, e, _number(w))
+    _write_lines(f, lines())
+
+
+def _number(x):
+    return int(x) if x == int(x) else x
+
+
+class _Checks(object):
+    """Collects (check, violation count, first violations)"""
+
+    def __init__(self):
+        self.results = []
+
+    def start(self, name):
+        self.results.append((name, [0], []))
+
+    def fail(self, msg):
+        name, count, shown = self.results[-1]
+        count[0] += 1
+        if len(shown) < SHOW_VIOLATIONS:
+            shown.append(msg)
+
+    def failed(self):
+        return self.results[-1][1][0] > 0
+
+    def report(self):
+        return [(name, count[0], shown) for name, count, shown in self.results]
+
+
+def _tree_order(bags, tree, checks):
+    """
+    Parent of every bag and the Euler tour intervals (tin, tout) of the
+    tree rooted at the smallest bag id, or None if it is not a tree.
+    """
+    adj = {b: [] for b in bags}
+    for a, b in tree:
+        if a not in adj or b not in adj:
+            checks.fail('tree edge {} {} names a missing bag'.format(a, b))
+            continue
+        adj[a].append(b)
+        adj[b].append(a)
+    if checks.failed():
+        return None
+    if len(tree) != len(bags) - 1:
+        checks.fail('{} tree edges for {} bags'.format(len(tree), len(bags)))
+        return None
+    root = min(bags)
+    parent = {root: None}
+    tin, tout = dict(), dict()
+    clock = 0
+    stack = [(root, iter(adj[root]))]
+    tin[root] = clock
+    while stack:
+        u, it = stack[-1]
+        for w in it:
+            if w == parent[u]:
+                continue
+            if w in parent:
+                checks.fail('cycle through bag {}'.format(w))
+                return None
+            parent[w] = u
+            clock += 1
+            tin[w] = clock
+            stack.append((w, iter(adj[w])))
+            break
+        else:
+            stack.pop()
+            tout[u] = clock
+    if len(parent) != len(bags):
+        checks.fail('bag {} is not connected to bag {}'.format(
+            min(set(bags) - set(parent)), root))
+        return None
+    return parent, tin, tout
+
+
+def check_decomposition(hg, d):
+    """
+    Validates the decomposition d against hg. Returns (width, kind,
+    checks) where kind is 'HD', 'GHD' or 'FHD' for a valid decomposition
+    with integral covers satisfying the special condition, integral covers
+    and fractional covers respectively, and None for an invalid one.
+    checks lists (check, violation count, first violations).
+
+    Every check is linear in the size of the file, apart from edge
+    coverage, which tests each edge against the bags of its rarest vertex.
+    """
+    checks = _Checks()
+    number = hg.vertex_numbering()
+    n = len(number)
+    edge_names = edge_order(hg)
+    edges = [tuple(number[v] for v in hg.edges[en]) for en in edge_names]
+    names = [None] * (n + 1)
+    for v, i in number.items():
+        names[i] = hg.vt.names[v]
+    bags = d.bags
+
+    checks.start('header')
+    n_bags, _, n_vertices, n_edges = d.declared
+    if (n_vertices, n_edges) != (n, len(edges)):
+        checks.fail('declared {} vertices, {} edges, hypergraph has {}, {}'
+                    .format(n_vertices, n_edges, n, len(edges)))
+    if n_bags != len(bags):
+        checks.fail('declared {} bags, found {}'.format(n_bags, len(bags)))
+    for b, bag in bags.items():
+        for v in bag:
+            if not 1 <= v <= n:
+                checks.fail('bag {} has unknown vertex {}'.format(b, v))
+    for b, c in d.cover.items():
+        if b not in bags:
+            checks.fail('cover of missing bag {}'.format(b))
+        for e in c:
+            if not 1 <= e <= len(edges):
+                checks.fail('bag {} covered by unknown edge {}'.format(b, e))
+    if checks.failed() or not bags:
+        return None, None, checks.report()
+
+    checks.start('tree')
+    order = _tree_order(bags, d.tree, checks)
+
+    # vertex number -> bags containing it
+    where = [[] for _ in range(n + 1)]
+    for b, bag in bags.items():
+        for v in bag:
+            where[v].append(b)
+
+    checks.start('edge coverage')
+    for en, e in zip(edge_names, edges):
+        if not e:
+            continue
+        rare = min(e, key=lambda v: len(where[v]))
+        if not any(bags[b].issuperset(e) for b in where[rare]):
+            checks.fail('edge {} is in no bag'.format(en))
+
+    top = None
+    if order is not None:
+        parent, tin, tout = order
+        checks.start('connectedness')
+        top = [None] * (n + 1)
+        for v in range(1, n + 1):
+            for b in where[v]:
+                p = parent[b]
+                if p is None or v not in bags[p]:
+                    if top[v] is not None:
+                        checks.fail('bags of vertex {} are disconnected '
+                                    '({} and {})'.format(names[v], top[v], b))
+                        break
+                    top[v] = b
+        if checks.failed():
+            top = None
+
+    checks.start('covers')
+    for b, bag in bags.items():
+        weight = dict()
+        for e, w in d.cover.get(b, dict()).items():
+            for v in edges[e - 1]:
+                if v in bag:
+                    weight[v] = weight.get(v, 0) + w
+        for v in bag:
+            if weight.get(v, 0) < 1 - EPSILON:
+                checks.fail('vertex {} of bag {} is not covered'.format(
+                    names[v], b))
+                break
+
+    integral = all(abs(w - round(w)) < EPSILON
+                   for c in d.cover.values() for w in c.values())
+    special = False
+    if integral and top is not None:
+        # a cover vertex v outside bag u appears below u exactly when the
+        # top bag of v lies in the subtree of u
+        checks.start('special condition')
+        for b, c in d.cover.items():
+            bag = bags[b]
+            for e in c:
+                for v in edges[e - 1]:
+                    t = top[v]
+                    if (v not in bag and t is not None
+                            and tin[b] < tin[t] <= tout[b]):
+                        checks.fail('vertex {} of the cover of bag {} '
+                                    'reappears in bag {} below it'.format(
+                                        names[v], b, t))
+        special = not checks.failed()
+
+    report = checks.report()
+    if any(count for name, count, shown in report
+           if name != 'special condition'):
+        return d.width(), None, report
+    kind = 'FHD' if not integral else 'HD' if special else 'GHD'
+    return d.width(), kind, report
@@ -0,0 +1,140 @@
+import codecs
+import mmap
+import os
+import re
+
+CHUNK_SIZE = 1 << 20
+
+_SKIP_RE = re.compile(r'(?:\s+|%[^\n]*|[,.])*')
+# an edge statement with the separators and comments before it
+_EDGE_RE = re.compile(_SKIP_RE.pattern + r'([\w:]+)\s*\(([^()]*)\)')
+_SPACE_RE = re.compile(r'\s')
+_NAME_RE = re.compile(r'[\w:]+')
+_OPEN_RE = re.compile(r'\s*(\(?)')
+_LIST_RE = re.compile(r'[^()]*')
+
+
+class HyperbenchSyntaxError(ValueError):
+    def __init__(self, msg, source, line, col):
+        super(HyperbenchSyntaxError, self).__init__(
+            '{}:{}:{}: {}'.format(source, line, col, msg))
+        self.source = source
+        self.line = line
+        self.col = col
+
+
+def parse_chunks(chunks, source='<input>'):
+    """
+    Yields (edge_name, vertex_list) for every edge statement in the
+    HyperBench text given as an iterable of string chunks. Only the
+    current chunk and at most one unfinished line or edge statement are
+    held in memory. Raises HyperbenchSyntaxError with line and column of
+    the first malformed statement.
+    """
+    buf = ''
+    pos = 0
+    base = 0        # offset of buf[0] in the whole input
+    line = 1        # line number at buf[0]
+    line_start = 0  # offset of the start of that line in the whole input
+
+    def error(msg, p):
+        last = buf.rfind('\n', 0, p)
+        if last >= 0:
+            col = p - last
+        else:
+            col = base + p - line_start + 1
+        raise HyperbenchSyntaxError(msg, source,
+                                    line + buf.count('\n', 0, p), col)
+
+    it = iter(chunks)
+    eof = False
+    pending = []  # chunks of a line that has not ended yet
+    while not eof:
+        chunk = next(it, None)
+        if chunk is None:
+            eof = True
+            chunk = ''
+        elif '\n' not in chunk:
+            # nothing to parse before the line ends, collect the pieces
+            # and join them once instead of copying buf for every chunk
+            pending.append(chunk)
+            continue
+        # drop everything already parsed, keeping track of the position
+        line += buf.count('\n', 0, pos)
+        last = buf.rfind('\n', 0, pos)
+        if last >= 0:
+            line_start = base + last + 1
+        base += pos
+        pending.append(chunk)
+        buf = buf[pos:] + ''.join(pending)
+        pending = []
+        pos = 0
+
+        # only parse complete lines until the input is exhausted, so that
+        # comments and names are never cut in half
+        end = len(buf) if eof else buf.rfind('\n') + 1
+        while True:
+            m = _EDGE_RE.match(buf, pos, end)
+            if m is not None:
+                name, vlist = m.groups()
+                vertices = vlist.split(',')
+                if _SPACE_RE.search(vlist):
+                    vertices = [v.strip() for v in vertices]
+                if '' in vertices:
+                    if len(vertices) == 1:
+                        error('edge {} has no vertices'.format(name),
+                              m.start(2))
+                    offset = 0
+                    for v in vlist.split(','):
+                        if v.strip() == '':
+                            break
+                        offset += len(v) + 1
+                    error('empty vertex name in edge {}'.format(name),
+                          m.start(2) + offset)
+                yield name, vertices
+                pos = m.end()
+                continue
+
+            pos = _SKIP_RE.match(buf, pos, end).end()
+            if pos == end:
+                break
+            # no complete statement at pos: find out whether it is broken
+            # or just continues in the next chunk
+            m = _NAME_RE.match(buf, pos, end)
+            if m is None:
+                error('expected edge name, found {!r}'.format(buf[pos]), pos)
+            name = m.group(0)
+            if m.end() == end and not eof:
+                break
+            m = _OPEN_RE.match(buf, m.end(), end)
+            if m.group(1) == '':
+                if m.end() == end and not eof:
+                    break
+                if m.end() == end:
+                    error('unexpected end of input after edge name {}'.format(name),
+                          m.end())
+                error("expected '(' after edge name {}, found {!r}".format(
+                    name, buf[m.end()]), m.end())
+            m = _LIST_RE.match(buf, m.end(), end)
+            if m.end() == end:
+                if not eof:
+                    break
+                error('unclosed vertex list of edge {}'.format(name), m.end())
+            error("unexpected '{}' in vertex list of edge {}".format(
+                buf[m.end()], name), m.end())
+
+
+def _read_chunks(path, chunk_size):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            for start in range(0, len(mm), chunk_size):
+                yield decoder.decode(mm[start:start + chunk_size])
+            yield decoder.decode(b'', final=True)
+
+
+def iter_edges(path, chunk_size=CHUNK_SIZE):
+    """Streams (edge_name, vertex_list) pairs from a HyperBench file"""
+    return parse_chunks(_read_chunks(path, chunk_size), source=path)
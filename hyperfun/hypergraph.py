@@ -1,17 +1,423 @@
-import networkx as nx
-import re
 import pprint
 import itertools
-import colorama
-from termcolor import colored
-colorama.init()
+import gc
+import heapq
+import io
+import operator
+from contextlib import contextmanager
+from array import array
+from collections.abc import Mapping, Sequence, Set
+from .acyclic import gyo_core, join_tree
+from .export import write_hyperbench, write_pace, write_visualsc
+from .hyperbench import iter_edges
+from .lru import LRUCache
+from .prefix import PrefixIndex
 
+CACHE_SIZE = 16
+COLOR = True  # ANSI colors in fancy_repr, see set_color
 
-class HyperGraph(object):
+
+def set_color(enabled):
+    global COLOR
+    COLOR = enabled
+
+
+def _to_string(writer, hg, *args):
+    f = io.StringIO()
+    writer(hg, f, *args)
+    return f.getvalue().rstrip('\n')
+
+
+@contextmanager
+def _gc_paused():
+    """Bulk construction allocates millions of tuples that can never form
+    reference cycles, don't let the cyclic collector rescan them"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def component_labels(edges, vertices, sep):
+    """
+    Connected components of the hypergraph with edges (name -> vertex ids)
+    after removing the vertices in sep. Uses a disjoint-set forest over the
+    hyperedges directly, so it is linear in the total edge size instead of
+    quadratic like the primal graph. Returns a dict mapping every vertex
+    outside sep to the representative of its component.
+    """
+    parent = {v: v for v in vertices if v not in sep}
+    size = dict.fromkeys(parent, 1)
+
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for e in edges.values():
+        r = None
+        for v in e:
+            if v in sep:
+                continue
+            rv = find(v)
+            if r is None:
+                r = rv
+            elif rv != r:
+                if size[rv] > size[r]:
+                    r, rv = rv, r
+                parent[rv] = r
+                size[r] += size[rv]
+    return {v: find(v) for v in parent}
+
+
+def component_edges(edges, labels, sep):
+    """
+    Edge names of each component after removing sep, given the labels
+    computed by component_labels, assigned in a single pass over the
+    edges. Edges inside sep belong to no component. Vertices without
+    edges form components of their own with an empty edge list.
+    """
+    comps = {r: [] for r in labels.values()}
+    for en, e in edges.items():
+        for v in e:
+            if v not in sep:
+                comps[labels[v]].append(en)
+                break
+    return list(comps.values())
+
+
+class VertexTable(object):
+    """
+    Interns vertex names to dense integer ids.
+    One table is shared by a hypergraph and everything derived from it,
+    so ids can be compared across components without mapping names.
+    """
     def __init__(self):
-        self.V = set()
-        self.E = list()
-        self.edge_dict = dict()
+        self.names = []
+        self.ids = dict()
+
+    def intern(self, v):
+        i = self.ids.get(v)
+        if i is None:
+            i = len(self.names)
+            self.ids[v] = i
+            self.names.append(v)
+        return i
+
+    def intern_edge(self, e):
+        """
+        Sorted tuple of the ids of an iterable of vertex names, without
+        repetitions. One dict lookup per known name.
+        """
+        get = self.ids.get
+        names = self.names
+        edge = []
+        for v in e:
+            i = get(v)
+            if i is None:
+                i = self.ids[v] = len(names)
+                names.append(v)
+            edge.append(i)
+        edge.sort()
+        if any(map(operator.eq, edge, edge[1:])):
+            edge = sorted(set(edge))
+        return tuple(edge)
+
+    def lookup(self, U):
+        """Set of ids of the known names in U, unknown names are ignored"""
+        ids = self.ids
+        return {ids[v] for v in U if v in ids}
+
+    def to_names(self, ids):
+        names = self.names
+        return {names[i] for i in ids}
+
+    def __len__(self):
+        return len(self.names)
+
+
+class _VertexView(Set):
+    """Vertex names of a hypergraph, mapped back from ids on access"""
+    __slots__ = ('_hg',)
+
+    def __init__(self, hg):
+        self._hg = hg
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return set(it)
+
+    def __contains__(self, v):
+        i = self._hg.vt.ids.get(v)
+        return i is not None and i in self._hg.vids
+
+    def __iter__(self):
+        names = self._hg.vt.names
+        return (names[i] for i in self._hg.vids)
+
+    def __len__(self):
+        return len(self._hg.vids)
+
+    def __repr__(self):
+        return repr(set(self))
+
+
+class _EdgeDictView(Mapping):
+    """Edge name -> set of vertex names, mapped back from ids on access"""
+    __slots__ = ('_hg',)
+
+    def __init__(self, hg):
+        self._hg = hg
+
+    def __getitem__(self, en):
+        return self._hg.vt.to_names(self._hg.edges[en])
+
+    def __contains__(self, en):
+        return en in self._hg.edges
+
+    def __iter__(self):
+        return iter(self._hg.edges)
+
+    def __len__(self):
+        return len(self._hg.edges)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class _EdgeListView(Sequence):
+    """Edges as sets of vertex names, in insertion order"""
+    __slots__ = ('_hg',)
+
+    def __init__(self, hg):
+        self._hg = hg
+
+    def __getitem__(self, i):
+        to_names = self._hg.vt.to_names
+        edges = list(self._hg.edges.values())
+        if isinstance(i, slice):
+            return [to_names(e) for e in edges[i]]
+        return to_names(edges[i])
+
+    def __iter__(self):
+        to_names = self._hg.vt.to_names
+        return (to_names(e) for e in self._hg.edges.values())
+
+    def __len__(self):
+        return len(self._hg.edges)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _EdgeView(Mapping):
+    """
+    Edges of a derived hypergraph that are shared with its parent: the
+    edges named in names (all of them if names is None) of the frozen edge
+    dict base, plus the edges added to the derived graph itself in extra.
+    items() and values() return iterators.
+    """
+    __slots__ = ('base', 'names', 'extra', '_index')
+
+    def __init__(self, base, names=None):
+        self.base = base
+        self.names = names
+        self.extra = dict()
+        self._index = None
+
+    def _selected(self, en):
+        if self.names is None:
+            return en in self.base
+        if self._index is None:
+            self._index = frozenset(self.names)
+        return en in self._index
+
+    def __getitem__(self, en):
+        if en in self.extra:
+            return self.extra[en]
+        if self._selected(en):
+            return self.base[en]
+        raise KeyError(en)
+
+    def __contains__(self, en):
+        return en in self.extra or self._selected(en)
+
+    def __iter__(self):
+        names = self.base if self.names is None else self.names
+        return itertools.chain(names, self.extra)
+
+    def __len__(self):
+        n = len(self.base) if self.names is None else len(self.names)
+        return n + len(self.extra)
+
+    def items(self):
+        base = self.base
+        names = base if self.names is None else self.names
+        return itertools.chain(((en, base[en]) for en in names),
+                               self.extra.items())
+
+    def values(self):
+        if self.names is None:
+            own = self.base.values()
+        else:
+            own = map(self.base.__getitem__, self.names)
+        return itertools.chain(own, self.extra.values())
+
+
+class HyperGraph(object):
+    """
+    Hypergraph over interned vertex ids.
+
+    edges maps every edge name to a sorted tuple of vertex ids from vt,
+    vids is the set of vertex ids. V, E and edge_dict present the same
+    data with vertex names for output and for callers working on names.
+
+    Derived hypergraphs share structure with their parent: edge tuples are
+    immutable and shared everywhere, and copies, components and edge
+    subgraphs get an _EdgeView over the parent's edge dict instead of a
+    dict of their own. Shared containers are copied before a mutation.
+    """
+    def __init__(self, vt=None):
+        self.vt = VertexTable() if vt is None else vt
+        self.edges = dict()
+        self._vids = set()
+        self._shared_edges = False  # edges is referenced by a view
+        self._shared_vids = False   # _vids is referenced by another graph
+        self._incidence = None
+        self._csr = None
+        self._cache = None
+        self._version = 0  # counts mutations, see _touch
+
+    @property
+    def vids(self):
+        if self._vids is None:
+            vids = set()
+            for e in self.edges.values():
+                vids.update(e)
+            self._vids = vids
+        return self._vids
+
+    @property
+    def V(self):
+        return _VertexView(self)
+
+    @property
+    def E(self):
+        return _EdgeListView(self)
+
+    @property
+    def edge_dict(self):
+        return _EdgeDictView(self)
+
+    def _derived(self):
+        """Empty hypergraph sharing the vertex table of self"""
+        return HyperGraph(vt=self.vt)
+
+    def _view(self, names=None):
+        """
+        Hypergraph on the edges named in names (all if None) that shares
+        the edge dict of self until either of them is mutated. Its vertex
+        set is computed from the edges when first needed.
+        """
+        edges = self.edges
+        if isinstance(edges, _EdgeView):
+            if edges.extra:
+                self._own_edges()
+                return self._view(names)
+            if names is None:
+                names = edges.names
+            base = edges.base
+        else:
+            base = edges
+            self._shared_edges = True
+        h = self._derived()
+        h.edges = _EdgeView(base, None if names is None else tuple(names))
+        h._vids = None
+        return h
+
+    def _own_edges(self):
+        """Make edges a dict that no other hypergraph references"""
+        if isinstance(self.edges, _EdgeView):
+            self.edges = dict(self.edges.items())
+        elif self._shared_edges:
+            self.edges = dict(self.edges)
+        self._shared_edges = False
+
+    def _own_vids(self):
+        vids = self.vids
+        if self._shared_vids:
+            self._vids = set(vids)
+            self._shared_vids = False
+        return self._vids
+
+    def _touch(self):
+        """Drop everything computed from the edges, called on mutation"""
+        self._version += 1
+        self._csr = None
+        if self._cache is not None:
+            self._cache.clear()
+
+    @property
+    def cache(self):
+        """LRU cache of structures derived from the edges, see _touch"""
+        if self._cache is None:
+            self._cache = LRUCache(CACHE_SIZE)
+        return self._cache
+
+    def _labels(self, sep):
+        """Component labelling after removing the frozenset sep of ids"""
+        return self.cache.get(
+            ('labels', sep),
+            lambda: component_labels(self.edges, self.vids, sep))
+
+    def _incidence_index(self):
+        """
+        Vertex id -> set of names of the edges containing it. Built on first
+        use, afterwards kept in sync by _add_ids and remove_edge.
+        """
+        if self._incidence is None:
+            inc = dict()
+            for en, e in self.edges.items():
+                for v in e:
+                    if v in inc:
+                        inc[v].add(en)
+                    else:
+                        inc[v] = {en}
+            self._incidence = inc
+        return self._incidence
+
+    def _touching_ids(self, U):
+        """Names of the edges that intersect the vertex id set U"""
+        inc = self._incidence_index()
+        touching = set()
+        for v in U:
+            touching.update(inc.get(v, ()))
+        return touching
+
+    def degree(self, v):
+        i = self.vt.ids.get(v)
+        if i is None:
+            return 0
+        return len(self._incidence_index().get(i, ()))
+
+    def neighbours(self, v):
+        """Vertices sharing an edge with v"""
+        i = self.vt.ids.get(v)
+        if i is None:
+            return set()
+        nb = set()
+        for en in self._incidence_index().get(i, ()):
+            nb.update(self.edges[en])
+        nb.discard(i)
+        return self.vt.to_names(nb)
+
+    def edges_touching(self, U):
+        """Names of the edges that contain some vertex of U"""
+        return self._touching_ids(self.vt.lookup(U))
 
     def grid(n, m):
         h = HyperGraph()
@@ -35,120 +441,230 @@ class HyperGraph(object):
         return h
 
     def copy(self):
-        h = HyperGraph()
-        for en, e in self.edge_dict.items():
-            h.add_edge(e, name=en)
+        h = self._view()
+        h._vids = self.vids
+        h._shared_vids = self._shared_vids = True
         return h
 
     def join_copy(self, x, y):
         """Copy of self with vertices x and y joined"""
         if x not in self.V or y not in self.V:
             raise ValueError('Join vertices need to be in hypergraph')
-        h = HyperGraph()
-        for en, e in self.edge_dict.items():
-            e2 = e.copy()
-            if y in e2:
-                e2.remove(y)
-                e2.add(x)
-            h.add_edge(e2, name=en)
+        xi, yi = self.vt.ids[x], self.vt.ids[y]
+        h = self._derived()
+        for en, e in self.edges.items():
+            if yi in e:
+                e = tuple(sorted(set(e).difference((yi,)).union((xi,))))
+            h._add_ids(e, en)
         return h
 
     def toHyperbench(self):
-        s = []
-        for en, e in sorted(self.edge_dict.items()):
-            s.append('{}({}),'.format(en, ','.join(e)))
-        return '\n'.join(s)
+        return _to_string(write_hyperbench, self)
 
     def vertex_induced_subg(self, U):
         """Induced by vertex set U"""
-        h = HyperGraph()
-        for en, e in self.edge_dict.items():
-            e2 = e.copy()
-            e2 = e2 & U
-            if e2 != set():
-                h.add_edge(e2, name=en)
+        U = self.vt.lookup(U)
+        h = self._derived()
+        for en in sorted(self._touching_ids(U)):
+            e = self.edges[en]
+            e2 = tuple(v for v in e if v in U)
+            if len(e2) == len(e):
+                h._add_ids(e, en)
+            else:
+                h._add_ids(e2, en)
         return h
 
     def bridge_subg(self, U):
-        EC = [en for en, e in self.edge_dict.items() if
-              (e & U) != set()]
-        C = self.edge_subg(EC)
-
-        # for each component C_i of rest, compute a special edge Sp_i
-        for C_i in self.separate(U):
-            print(C_i)
-            Sp_i_parts = [(e - U) for e in C.E if (e & C_i.V) != set()]
-            Sp_i = set.union(*Sp_i_parts)
-            C.add_special_edge(Sp_i)
+        """
+        The edges touching the vertices U, plus one special edge per
+        component of the rest (the graph without U) that such an edge
+        reaches: the bridge set of the component, the union of the parts
+        outside U of the edges of the subgraph going into it. Edges that
+        meet a component only in vertices of U do not count for it.
+        Special edges follow the order of the components of separate(U).
+        """
+        Uids = self.vt.lookup(U)
+        C = self.edge_subg(sorted(self._touching_ids(Uids)))
+
+        # the outside part of each edge of C lies in a single component of
+        # the rest, collect them per component in one pass
+        labels = self._labels(frozenset(Uids))
+        bridges = dict()
+        for e in C.edges.values():
+            rest = [v for v in e if v not in Uids]
+            if rest:
+                bridges.setdefault(labels[rest[0]], set()).update(rest)
+
+        # components appear in the labels in the order separate lists them
+        for r in dict.fromkeys(labels.values()):
+            if r in bridges:
+                C._add_special_ids(bridges[r])
         return C
 
     def edge_subg(self, edge_names):
-        h = HyperGraph()
         for en in edge_names:
-            if en not in self.edge_dict:
+            if en not in self.edges:
                 raise ValueError('Edge >{}< not present in hypergraph'.format(en))
-            h.add_edge(self.edge_dict[en].copy(), en)
-        return h
+        return self._view(dict.fromkeys(edge_names))
 
     def fromHyperbench(fname):
-        EDGE_RE = re.compile('\s*([\w:]+)\s?\(([^\)]*)\)')
-        def split_to_edge_statements(s):
-            x = re.compile('\w+\s*\([^\)]+\)')
-            return list(x.findall(s))
-
-        def cleanup_lines(rl):
-            a = map(str.rstrip, rl)
-            b = filter(lambda x: not x.startswith('%') and len(x) > 0, a)
-            return split_to_edge_statements(''.join(b))
-
-        def line_to_edge(l):
-            m = EDGE_RE.match(l)
-            name = m.group(1)
-            e = m.group(2).split(',')
-            e = set(map(str.strip, e))
-            return name, e            
-
-        with open(fname) as f:
-            raw_lines = f.readlines()
-        lines = cleanup_lines(raw_lines)
-
         hg = HyperGraph()
-        for l in lines:
-            edge_name, edge = line_to_edge(l)
-            hg.add_edge(edge, edge_name)
+        intern_edge = hg.vt.intern_edge
+        with _gc_paused():
+            # intern in file order, so that vertex ids (and the exported
+            # vertex numbering) do not depend on string hashing
+            hg.edges = {edge_name: intern_edge(edge)
+                        for edge_name, edge in iter_edges(fname)}
+        # every interned vertex is in an edge
+        hg._vids = set(range(len(hg.vt)))
+        hg._touch()
+        return hg
+
+    def fromCSR(vertex_names, edge_names, indptr, indices, vt=None):
+        """
+        Bulk construction from a CSR incidence layout over local vertex
+        numbers 0..len(vertex_names)-1. The vertices of every edge must be
+        sorted and distinct. The names are interned into vt if given, so
+        that ids agree with the other graphs over that table, else into a
+        new table. indptr and indices are kept as the csr() cache of the
+        new hypergraph where local numbers are its ids, and must not
+        change while the graph is used.
+        """
+        hg = HyperGraph(vt)
+        vt = hg.vt
+        if len(vt) == 0:
+            vt.names = list(vertex_names)
+            vt.ids = {v: i for i, v in enumerate(vt.names)}
+            local = range(len(vt.names))
+            if len(vt.ids) != len(vt.names):
+                raise ValueError('Vertex names are not unique')
+        else:
+            local = [vt.intern(v) for v in vertex_names]
+            if len(set(local)) != len(local):
+                raise ValueError('Vertex names are not unique')
+        hg._vids = set(local)
+        ids = indices.tolist()
+        identity = isinstance(local, range) or local == list(
+            range(len(local)))
+        if not identity:
+            ids = list(map(local.__getitem__, ids))
+        bounds = indptr.tolist()
+        slices = map(slice, bounds, bounds[1:])
+        with _gc_paused():
+            edges = map(tuple, map(ids.__getitem__, slices))
+            if not all(a < b for a, b in zip(local, local[1:])):
+                # the table numbers the vertices in another order
+                edges = (tuple(sorted(e)) for e in edges)
+            hg.edges = dict(zip(edge_names, edges))
+        if len(hg.edges) != len(edge_names):
+            raise ValueError('Edge names are not unique')
+        if identity:
+            hg._csr = (list(edge_names), indptr, indices)
         return hg
 
     def add_edge(self, edge, name):
-        assert(type(edge) == set)
-        self.edge_dict[name] = edge
-        self.V.update(edge)
-        self.E.append(edge)
+        assert(isinstance(edge, (set, frozenset)))
+        self._add_ids(self.vt.intern_edge(edge), name)
+
+    def _add_ids(self, e, name):
+        """Add edge given as sorted tuple of vertex ids"""
+        if self._vids is not None:
+            self._own_vids().update(e)
+        if self._incidence is not None:
+            if name in self.edges:
+                self._unindex(name)
+            for v in e:
+                if v in self._incidence:
+                    self._incidence[v].add(name)
+                else:
+                    self._incidence[v] = {name}
+        if isinstance(self.edges, _EdgeView) and name not in self.edges:
+            self.edges.extra[name] = e
+        else:
+            self._own_edges()
+            self.edges[name] = e
+        self._touch()
 
     def add_special_edge(self, sp):
+        self._add_special_ids(self.vt.intern_edge(sp))
+
+    def _add_special_ids(self, sp):
         SPECIAL_NAME = 'Special'
         # find a name first
         sp_name = None
         for i in itertools.count():
             candidate = SPECIAL_NAME + str(i)
-            if candidate not in self.edge_dict:
+            if candidate not in self.edges:
                 sp_name = candidate
                 break
-        self.add_edge(sp, sp_name)
+        self._add_ids(tuple(sorted(sp)), sp_name)
+
+    def _unindex(self, name):
+        for v in self.edges[name]:
+            en = self._incidence[v]
+            en.discard(name)
+            if not en:
+                del self._incidence[v]
 
     def remove_edge(self, name):
-        e = self.edge_dict[name]
-        del self.edge_dict[name]
-        self.E.remove(e)
+        self.vids  # removed vertices stay, fix the vertex set first
+        if self._incidence is not None:
+            self._unindex(name)
+        self._own_edges()
+        del self.edges[name]
+        self._touch()
+
+    def vertex_numbering(self):
+        """
+        Vertex id -> number from 1 to |V| in id order, which is the order
+        the vertices were first read in. Used by all numbered exports.
+        """
+        return self.cache.get(
+            ('numbering',),
+            lambda: {v: i for i, v in enumerate(sorted(self.vids), start=1)})
+
+    def vertex_index(self):
+        """PrefixIndex of the vertex names, for completion"""
+        names = self.vt.names
+        return self.cache.get(
+            ('vertex_index',),
+            lambda: PrefixIndex(names[v] for v in self.vids))
+
+    def edge_index(self):
+        """PrefixIndex of the edge names, for completion"""
+        return self.cache.get(('edge_index',),
+                              lambda: PrefixIndex(self.edges))
+
+    def csr(self):
+        """
+        Compressed sparse row incidence layout (edge_names, indptr, indices):
+        the vertex ids of edge_names[i] are indices[indptr[i]:indptr[i+1]].
+        Built on first use and kept until the hypergraph is mutated.
+        """
+        if self._csr is None:
+            indptr = array('q', [0])
+            indices = array('q')
+            for e in self.edges.values():
+                indices.extend(e)
+                indptr.append(len(indices))
+            self._csr = (list(self.edges), indptr, indices)
+        return self._csr
 
     def primal_nx(self):
-        G = nx.Graph()
-        G.add_nodes_from(self.V)
-        for i, e in enumerate(self.E):
-            for a, b in itertools.combinations(e, 2):
-                G.add_edge(a, b)
-        return G
+        """Primal graph, cached and therefore frozen (see nx.freeze)"""
+        import networkx as nx
+
+        def build():
+            G = nx.Graph()
+            G.add_nodes_from(self.V)
+            for e in self.E:
+                for a, b in itertools.combinations(e, 2):
+                    G.add_edge(a, b)
+            return nx.freeze(G)
+        return self.cache.get(('primal',), build)
 
     def incidence_nx(self, without=[]):
+        import networkx as nx
         G = nx.Graph()
         G.add_nodes_from(self.V)
         G.add_nodes_from(self.edge_dict.keys())
@@ -160,68 +676,114 @@ class HyperGraph(object):
         return G
 
     def toPACE(self, special=[]):
-        buf = list()
-        vertex2int = {v: str(i) for i, v in enumerate(self.V, start=1)}
-        buf.append('p htd {} {}'.format(len(self.V),
-                                        len(self.E)))
-        for i, ei in enumerate(sorted(self.edge_dict.items()), start=1):
-            en, e = ei
-            edgestr = ' '.join(map(lambda v: vertex2int[v], e))
-            line = '{} {}'.format(i, edgestr)
-            buf.append(line)
-
-        if special is None:
-            special = []
-        for sp in special:
-            if sp is None:
-                continue
-            edgestr = ' '.join(map(lambda v: vertex2int[v], sp))
-            buf.append('s ' + edgestr)
-        return '\n'.join(buf)
+        return _to_string(write_pace, self, special)
 
     def separation_subg(self, U, sep):
-        C = HyperGraph()
+        return self._separation_subg_ids(self.vt.lookup(U),
+                                         self.vt.lookup(sep))
+
+    def _separation_subg_ids(self, U, sep):
+        # an edge inside U | sep but not inside sep meets U - sep
         cover = U | sep
-        for en, e in self.edge_dict.items():
-            if e.issubset(cover) and not e.issubset(sep):
-                C.add_edge(e, en)
-        return C
+        names = [en for en in sorted(self._touching_ids(U - sep))
+                 if cover.issuperset(self.edges[en])]
+        return self._view(names)
 
     def separate(self, sep):
         """Returns list of components"""
         assert(type(sep) == set)
-        primal = self.primal_nx()
-        primal.remove_nodes_from(sep)
-        comp_vertices = nx.connected_components(primal)
-        comps = [self.separation_subg(U, sep)
-                 for U in comp_vertices]
-        return comps
+        sep = frozenset(self.vt.lookup(sep))
+
+        def build():
+            labels = self._labels(sep)
+            return [self._view(names)
+                    for names in component_edges(self.edges, labels, sep)]
+        # callers modify the components, hand out cheap copies of them
+        return [C.copy() for C in self.cache.get(('separate', sep), build)]
+
+    def num_components(self):
+        return len(set(self._labels(frozenset()).values()))
+
+    def join_tree(self):
+        """
+        Width 1 hypertree decomposition (see htd.Decomposition) following a
+        join tree if the hypergraph is alpha-acyclic, None otherwise
+        """
+        return self.cache.get(('join_tree',), lambda: join_tree(self))
+
+    def is_acyclic(self):
+        return self.join_tree() is not None
+
+    def gyo_core(self):
+        """What is left after GYO reduction, no edges iff acyclic"""
+        return gyo_core(self)
 
     def toVisualSC(self):
-        vertex2int = {v: str(i) for i, v in enumerate(self.V, start=1)}
-        edges = map(lambda e: map(lambda v: vertex2int[v], e), self.E)
-        buf = []
-        for e in edges:
-            buf.append('{'+', '.join(e) + '}')
-        return ' '.join(buf)
-
-    def fancy_repr(self, hl=[]):
-        edge_style = colorama.Fore.RED + colorama.Style.NORMAL
-        vertex_style = colorama.Fore.YELLOW + colorama.Style.NORMAL
-        hl_style = colorama.Fore.WHITE + colorama.Back.GREEN + colorama.Style.BRIGHT
-        _reset = colorama.Style.RESET_ALL
+        return _to_string(write_visualsc, self)
+
+    def fancy_repr(self, hl=[], edges=None):
+        """Colored edge list, restricted to the edge names in edges if given"""
+        return ''.join(l + '\n' for l in self.repr_lines(hl, edges))
+
+    def repr_lines(self, hl=(), edges=None, limit=None):
+        """
+        Lines of fancy_repr, generated lazily in edge name order. With a
+        limit only the first limit edges are formatted, followed by a line
+        counting the rest.
+        """
+        if COLOR:
+            import colorama
+            edge_style = colorama.Fore.RED + colorama.Style.NORMAL
+            vertex_style = colorama.Fore.YELLOW + colorama.Style.NORMAL
+            hl_style = colorama.Fore.WHITE + colorama.Back.GREEN + colorama.Style.BRIGHT
+            _reset = colorama.Style.RESET_ALL
+        else:
+            edge_style = vertex_style = hl_style = _reset = ''
+        hl = self.vt.lookup(hl)
+        names = self.vt.names
 
         def color_vertex(v):
             if v in hl:
-                return hl_style + v + _reset
+                return hl_style + names[v] + _reset
             else:
-                return vertex_style + v + _reset
-        s = ''
-        for en, e in sorted(self.edge_dict.items()):
-            s += edge_style + en + _reset + '('
-            s += ','.join(map(color_vertex, e))
-            s += ')\n'
-        return s
+                return vertex_style + names[v] + _reset
+        if edges is None:
+            edges = self.edges
+        total = len(edges)
+        if limit is None or limit >= total:
+            order = sorted(edges)
+        else:
+            order = heapq.nsmallest(limit, edges)
+        for en in order:
+            yield '{}{}{}({})'.format(edge_style, en, _reset,
+                                      ','.join(map(color_vertex, self.edges[en])))
+        if len(order) < total:
+            yield '... {} more edges'.format(total - len(order))
+
+    def summary(self):
+        return '{} vertices, {} edges'.format(len(self.vids), len(self.edges))
+
+    def memory_objects(self):
+        """
+        The containers and edge tuples making up this hypergraph, for
+        memory accounting. Objects shared with other hypergraphs are
+        yielded by each of them. The vertex table is not included.
+        """
+        edges = self.edges
+        yield edges
+        if isinstance(edges, _EdgeView):
+            yield edges.base
+            for obj in (edges.names, edges.extra, edges._index):
+                if obj is not None:
+                    yield obj
+        yield from edges.values()
+        if self._vids is not None:
+            yield self._vids
+        if self._incidence is not None:
+            yield self._incidence
+            yield from self._incidence.values()
+        if self._csr is not None:
+            yield from self._csr
 
     def __repr__(self):
         return self.fancy_repr()
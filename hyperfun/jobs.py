@@ -0,0 +1,91 @@
+import itertools
+import time
+
+WORKERS = 2
+
+
+class Job(object):
+    """
+    A command running in the background. work() runs on a worker thread,
+    done(result) is called by the REPL thread when the job is collected,
+    so that only the REPL thread touches the session state. Queries fill
+    the caches and indices of a hypergraph, so work() must not use a
+    hypergraph the REPL thread can reach either, but a copy of it.
+    """
+
+    def __init__(self, jid, command, future, done):
+        self.id = jid
+        self.command = command
+        self.future = future
+        self.done = done
+        self.started = time.perf_counter()
+        self.finished = None
+        self.cancelled = False
+        self.collected = False
+        future.add_done_callback(self._finish)
+
+    def _finish(self, _future):
+        self.finished = time.perf_counter()
+
+    def status(self):
+        if self.cancelled:
+            return 'cancelled'
+        if self.future.running():
+            return 'running'
+        if not self.future.done():
+            return 'pending'
+        return 'failed' if self.future.exception() is not None else 'done'
+
+    def seconds(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+
+class JobManager(object):
+    def __init__(self, workers=WORKERS):
+        self.workers = workers
+        self.jobs = dict()
+        self._pool = None
+        self._ids = itertools.count(1)
+
+    def submit(self, command, work, done):
+        if self._pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._pool = ThreadPoolExecutor(self.workers)
+        jid = next(self._ids)
+        self.jobs[jid] = Job(jid, command, self._pool.submit(work), done)
+        return jid
+
+    def get(self, jid):
+        if jid not in self.jobs:
+            raise ValueError('No job {}'.format(jid))
+        return self.jobs[jid]
+
+    def finished(self):
+        """Finished jobs not collected before, in submission order"""
+        for jid in sorted(self.jobs):
+            job = self.jobs[jid]
+            if not job.collected and job.future.done():
+                job.collected = True
+                yield job
+
+    def wait(self, jids=None):
+        """Blocks until the jobs (default all) are finished"""
+        from concurrent.futures import wait
+        jobs = self.jobs.values() if jids is None else map(self.get, jids)
+        wait([job.future for job in jobs])
+
+    def cancel(self, jid):
+        """
+        Jobs that did not start yet are dropped. A running job cannot be
+        interrupted, its result is discarded when it finishes. Returns
+        whether the job was dropped.
+        """
+        job = self.get(jid)
+        job.cancelled = True
+        return job.future.cancel()
+
+    def cancel_all(self):
+        for jid, job in self.jobs.items():
+            if not job.future.done():
+                self.cancel(jid)
@@ -0,0 +1,31 @@
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """Bounded mapping that evicts the least recently used entry"""
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, compute):
+        """Cached value for key, compute() it on a miss"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return value
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
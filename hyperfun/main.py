@@ -1,56 +1,125 @@
 from cmd import Cmd
-from hypergraph import HyperGraph
+from .hypergraph import HyperGraph
+from .jobs import JobManager
+from .store import ComponentStore
+from .htd import check_decomposition, read_htd, write_htd
+from .width import BUDGET, width_bounds
+from .export import FORMATS
+from .snapshot import is_snapshot, read_snapshot, write_snapshot
+from .balsep import balanced_separators
+from .reduce import Reduction, reduce_hypergraph
+from .evaluate import (edge_pairs, evaluate_separators, neighbourhoods,
+                      separator_file, top_separators)
 from functools import reduce
+import argparse
+import itertools
+import os
+import subprocess
 import sys
+import time
+import tracemalloc
 import glob
 import pprint
-import networkx as nx
-import coolname
-import readline
-readline.set_completer_delims(' \t\n')  # for proper filename completion
 
 INITIAL_HG_NAME = 'init'
+SHOW_LIMIT = 100
+EXPORT_BUFFER = 1 << 20
+BACKGROUND_COMMANDS = ('sep', 'separate', 'spec', 'special', 'bridge_subg',
+                       'edge_subgraph', 'load')
+PROFILE_TOP = 15  # functions and allocation sites printed by profile
+
+
+def _start_tracing():
+    """
+    Starts tracemalloc, or resets its peak if it is tracing already (on
+    Python 3.9+), for _stop_tracing
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+    return started, tracemalloc.get_traced_memory()[0]
+
+
+def _stop_tracing(tracing):
+    """
+    Peak bytes allocated since _start_tracing returned tracing, stops
+    tracemalloc again if that started it
+    """
+    started, before = tracing
+    peak = tracemalloc.get_traced_memory()[1] - before
+    if started:
+        tracemalloc.stop()
+    return peak
+
+
+def read_hypergraph(path):
+    """HyperBench file or binary snapshot"""
+    if is_snapshot(path):
+        return read_snapshot(path)
+    return HyperGraph.fromHyperbench(path)
 
 
 class State:
     def __init__(self):
-        self.hg = None
         self.current_component = None
-        self.components = dict()
+        self.components = ComponentStore()
         self.component_counter = 1
         self.history = []  # maybe change to real stack
+        self.show_limit = SHOW_LIMIT  # edges printed by show, None for all
+        self.pager = False
+        self.timing = False
+        self.timings = []  # (command, seconds, peak allocated bytes)
+        self.reductions = dict()  # reduced component -> (original, Reduction)
+
+    @property
+    def hg(self):
+        """
+        The active component, looked up in the store on every access so
+        that it is never an object the store has evicted
+        """
+        if self.current_component is None:
+            return None
+        return self.components[self.current_component]
 
     def ready(self):
-        return self.hg is not None
+        return self.current_component is not None
+
+    def _cool_new_name(self, base=None):
+        if base is None:
+            base = self.current_component
+
+        import coolname
 
-    def _cool_new_name(self):
         def gen_name():
-            return '{}-{}'.format(self.current_component,
-                                  coolname.generate()[0])
+            return '{}-{}'.format(base, coolname.generate()[0])
         new_name = gen_name()
         while new_name in self.components:
             new_name = gen_name()
         return new_name
 
-    def make_grid(self, n, m):
-        hg = HyperGraph.grid(n, m)
-        self.hg = hg
+    def set_initial(self, hg):
         self.components[INITIAL_HG_NAME] = hg
         self.current_component = INITIAL_HG_NAME
 
+    def make_grid(self, n, m):
+        self.set_initial(HyperGraph.grid(n, m))
+
     def load_initial(self, path):
-        hg = HyperGraph.fromHyperbench(path)
-        self.hg = hg
-        self.components[INITIAL_HG_NAME] = hg
-        self.current_component = INITIAL_HG_NAME
+        self.set_initial(read_hypergraph(path))
 
     def separate(self, sep, add_special):
         sep = set(sep)
-        components = self.hg.separate(sep)
+        return self.register_separation(self.hg.separate(sep), sep,
+                                        add_special)
+
+    def register_separation(self, components, sep, add_special):
+        """Adds components of a separation by sep as C01, C02, ..."""
         newlist = list()
         for C in components:
             if add_special:
-                C.add_special_edge(sep)
+                C.add_special_edge(set(sep))
 
             name = 'C{:02d}'.format(self.component_counter)
             self.component_counter += 1
@@ -59,30 +128,28 @@ class State:
             newlist.append((name, C))
         return newlist
 
+    def register_subgraph(self, hg, base=None, connected=False):
+        """
+        Adds hg under a new name derived from component base (default the
+        active one). Warns if connected is set and hg is not connected.
+        """
+        new_name = self._cool_new_name(base)
+        self.components[new_name] = hg
+        if connected and hg.num_components() > 1:
+            print('WARNING: {} is not connected'.format(new_name))
+        return new_name, hg
+
     def vertex_induced_subg(self, U, complement=False):
         if complement:
             U = set(self.hg.V) - U
-        nhg = self.hg.vertex_induced_subg(U)
-        new_name = self._cool_new_name()
-        self.components[new_name] = nhg
-        return new_name, nhg
+        return self.register_subgraph(self.hg.vertex_induced_subg(U))
 
     def bridge_subg(self, C):
-        nhg = self.hg.bridge_subg(C)
-        new_name = self._cool_new_name()
-        self.components[new_name] = nhg
-        return new_name, nhg
+        return self.register_subgraph(self.hg.bridge_subg(C))
 
     def edge_subg(self, edge_names):
-        newhg = self.hg.edge_subg(edge_names)
-        new_name = self._cool_new_name()
-        self.components[new_name] = newhg
-
-        # refactor this into general componenet adding method
-        primal = newhg.primal_nx()
-        if nx.number_connected_components(primal) > 1:
-            print('WARNING: {} is not connected'.format(new_name))
-        return new_name, newhg
+        return self.register_subgraph(self.hg.edge_subg(edge_names),
+                                      connected=True)
 
     def introduce_join(self, x, y):
         newhg = self.hg.join_copy(x, y)
@@ -92,6 +159,41 @@ class State:
         self.components[new_name] = newhg
         return new_name, newhg
 
+    def reduce(self):
+        new_name = '{}_reduced'.format(self.current_component)
+        if new_name in self.components:
+            raise RuntimeError('This reduction already exists in state')
+        newhg, reduction = reduce_hypergraph(self.hg)
+        self.components[new_name] = newhg
+        self.reductions[new_name] = (self.current_component, reduction)
+        return new_name, newhg, reduction
+
+    def unreduce(self):
+        """
+        Switches from a reduced component back to the one it was reduced
+        from, which is rebuilt from the reduction if it is gone
+        """
+        if self.current_component not in self.reductions:
+            raise ValueError('{} is not a reduced component'.format(
+                self.current_component))
+        original, reduction = self.reductions[self.current_component]
+        if original not in self.components:
+            self.components[original] = reduction.undo(self.hg)
+        return self.switch_to_comp(original)
+
+    def unreduce_vertices(self, U):
+        """The vertices of the original graph that U of a reduced one stand for"""
+        if self.current_component not in self.reductions:
+            raise ValueError('{} is not a reduced component'.format(
+                self.current_component))
+        _, reduction = self.reductions[self.current_component]
+        V = self.hg.V
+        unknown = [v for v in U if v not in V]
+        if unknown:
+            raise ValueError('Unknown vertices {}'.format(sorted(unknown)))
+        vt = reduction.vt
+        return vt.to_names(reduction.expand(vt.lookup(U)))
+
     def switch_to_comp(self, component_name, add_to_hist=True):
         if component_name == self.current_component:
             raise ValueError('Already at that componenet')
@@ -99,7 +201,6 @@ class State:
             raise ValueError('Invalid component')
         if add_to_hist:
             self.history.append(self.current_component)
-        self.hg = self.components[component_name]
         self.current_component = component_name
         return self.current_component
 
@@ -113,41 +214,172 @@ class State:
     def vertex_complete(self, start):
         if self.hg is None:
             return []
-        return [v for v in self.hg.V if v.startswith(start)]
+        return self.hg.vertex_index().complete(start)
 
     def edge_complete(self, start):
         if self.hg is None:
             return []
-        return [en for en in self.hg.edge_dict.keys() if en.startswith(start)]
+        return self.hg.edge_index().complete(start)
 
     def component_completer(self, start):
-        component_names = self.components.keys()
-        return [n for n in component_names
-                if n.startswith(start)]
+        return self.components.name_index().complete(start)
+
+    def memory_usage(self):
+        """
+        Returns ([(component, own_bytes, shared_bytes)], total_bytes).
+        Shared bytes belong to objects that other components reference as
+        well, the total counts every object once, vertex tables included.
+        Only components in memory are counted, see ComponentStore.
+        """
+        sizes = dict()
+        users = dict()  # object id -> components referencing it
+        tables = dict()
+        resident = self.components.resident_items()
+        for name, hg in resident:
+            tables[id(hg.vt)] = hg.vt
+            for obj in hg.memory_objects():
+                key = id(obj)
+                if key not in sizes:
+                    sizes[key] = sys.getsizeof(obj)
+                    users[key] = set()
+                users[key].add(name)
+        own = {name: 0 for name, _ in resident}
+        shared = dict(own)
+        for key, names in users.items():
+            counts = own if len(names) == 1 else shared
+            for name in names:
+                counts[name] += sizes[key]
+        usage = [(name, own[name], shared[name]) for name, _ in resident]
+        total = sum(sizes.values())
+        for vt in tables.values():
+            total += sys.getsizeof(vt.names) + sys.getsizeof(vt.ids)
+            total += sum(map(sys.getsizeof, vt.names))
+        return usage, total
+
+    def cache_stats(self):
+        """(component, cached entries, hits, misses) for components in memory"""
+        return [(name, len(hg.cache), hg.cache.hits, hg.cache.misses)
+                for name, hg in self.components.resident_items()]
+
+    def clear_caches(self):
+        for name, hg in self.components.resident_items():
+            hg.cache.clear()
+
+    def record_timing(self, command, seconds, peak):
+        self.timings.append((command, seconds, peak))
+
+    def timing_stats(self):
+        """
+        (command, calls, total_seconds, max_seconds, max_peak_bytes) for
+        every recorded command, slowest in total first
+        """
+        stats = dict()
+        for command, seconds, peak in self.timings:
+            calls, total, slowest, biggest = stats.get(command, (0, 0, 0, 0))
+            stats[command] = (calls + 1, total + seconds,
+                              max(slowest, seconds), max(biggest, peak))
+        rows = [(command,) + s for command, s in stats.items()]
+        rows.sort(key=lambda r: -r[2])
+        return rows
+
+    def save_session(self, path):
+        self.components.save(path, {
+            'current': self.current_component,
+            'history': self.history,
+            'component_counter': self.component_counter,
+            'reductions': {reduced: [original, reduction.to_json()]
+                           for reduced, (original, reduction)
+                           in self.reductions.items()},
+        })
+
+    def load_session(path):
+        """State of a session saved with save_session"""
+        state = State()
+        state.components, extra = ComponentStore.load(path)
+        state.history = extra['history']
+        state.component_counter = extra['component_counter']
+        state.current_component = extra['current']
+        for reduced, (original, steps) in extra.get('reductions',
+                                                    {}).items():
+            vt = state.components.vertex_table(reduced)
+            state.reductions[reduced] = (original,
+                                         Reduction.fromJSON(steps, vt))
+        return state
 
     def __repr__(self):
-        s = pprint.pformat(self.components)
-        s += '\nActive: {}\n'.format(self.current_component)
+        components = self.components
+        s = ''.join('{}: {}{}\n'.format(
+            name, components.summary(name),
+            '' if components.is_resident(name) else ' (on disk)')
+            for name in components)
+        s += 'Active: {}\n'.format(self.current_component)
         return s
 
   
+def _format_width(w):
+    if w is None:
+        return '-'
+    return str(int(w)) if w == int(w) else '{:.3f}'.format(w)
+
+
+def _format_measure(value, exact):
+    if isinstance(value, tuple) and len(value) == 4:
+        low, mean, high, hist = value
+        s = 'min {}, mean {:.2f}, max {}'.format(low, mean, high)
+        if hist:
+            s += ' ({})'.format(' '.join(
+                '{}:{}'.format(v, n) for v, n in sorted(hist.items())))
+        return s
+    if isinstance(value, tuple):
+        return '{} to {}'.format(*value) if not exact else str(value[0])
+    return str(value) if exact else '>= {} (out of time)'.format(value)
+
+
 class Prompt(Cmd):
     prompt = '福 '
     intro = 'Type ? for help'
-    state = State()
 
-    def __init__(self):
+    def __init__(self, path=None):
         super(Prompt, self).__init__()
-
-        if len(sys.argv) == 2:
-            path = sys.argv[1]
-            try:
-                self.do_load(path)
-            except Exception as e:
-                print('failed to load parameter hypergraph:', e)
-            print('Loaded >{}<'.format(path))
-        elif len(sys.argv) > 2:
-            print('WARNING: Use at most one command line argument')
+        self.state = State()
+        self.jobs = JobManager()
+        self._timer = None  # (command, _start_tracing(), start time)
+        self.error = None  # why the last command failed, see fail
+
+        if path is not None:
+            self.do_load(path)
+            if self.state.ready():
+                print('Loaded >{}<'.format(path))
+
+    def fail(self, *args):
+        """Prints why the current command failed and keeps it as error"""
+        print(*args)
+        self.error = ' '.join(map(str, args))
+
+    def default(self, line):
+        super(Prompt, self).default(line)
+        self.error = 'Unknown syntax: {}'.format(line)
+
+    def precmd(self, line):
+        self.error = None
+        self._collect_jobs()
+        self._timer = None
+        if self.state.timing:
+            command = self.parseline(line)[0]
+            if command:
+                self._timer = (command, _start_tracing(),
+                               time.perf_counter())
+        return line
+
+    def postcmd(self, stop, line):
+        if self._timer is not None:
+            command, tracing, start = self._timer
+            seconds = time.perf_counter() - start
+            peak = _stop_tracing(tracing)
+            self.state.record_timing(command, seconds, peak)
+            self._timer = None
+        self._collect_jobs()
+        return stop
 
     def _inp_list_split(inp):
         inp = inp.replace(',', ' ')
@@ -165,17 +397,41 @@ class Prompt(Cmd):
         except Exception as e:
             print('Error:', e)
 
+    def _print_lines(self, lines):
+        """
+        Prints lines from a generator, through the pager if it is on. The
+        pager pulls lines as they are read, so they are formatted lazily.
+        """
+        if not self.state.pager:
+            for l in lines:
+                print(l)
+            return
+        pager = subprocess.Popen(os.environ.get('PAGER', 'less -R'),
+                                 shell=True, stdin=subprocess.PIPE,
+                                 universal_newlines=True)
+        try:
+            for l in lines:
+                pager.stdin.write(l + '\n')
+            pager.stdin.close()
+        except BrokenPipeError:
+            pass  # pager was quit before the end
+        pager.wait()
+
+    def _show_limit(self):
+        return None if self.state.pager else self.state.show_limit
+
     def _output_new_comps(self, components,
                           old_edge_num=None, special=False):
         """
         Outputs list of pairs (component_name, component_hg).
-        If old_edge_num is set, output 1/2 - balancedness with respect to this number of edge for full graph.
-        If special is True, correct for newly added special edges in balancedness computation.
+        If old_edge_num is set, output 1/2 - balancedness with respect to
+        this number of edge for full graph.
+        If special is True, correct for newly added special edges in
+        balancedness computation.
         """
         balanced = True
         for cn, C in components:
-            print('{}:'.format(cn))
-            print(C)
+            print('{}: {}'.format(cn, C.summary()))
 
             # balanced checks
             C_sz = len(C.E)
@@ -197,68 +453,143 @@ class Prompt(Cmd):
     def do_grid(self, inp):
         dim = Prompt._inp_list_split(inp)
         if len(dim) != 2:
-            print('WARNING: dimensions given wrong')
+            self.fail('WARNING: dimensions given wrong')
             return
         if self.state.hg is not None:
-            print('WARNING: already have hypergraph, ignoring until "reset"')
+            self.fail('WARNING: already have hypergraph, '
+                      'ignoring until "reset"')
             return
         try:
             dim = list(map(int, dim))
             self.state.make_grid(dim[0], dim[1])
         except Exception as e:
-            print('Error', e)
+            self.fail('Error', e)
 
     def help_grid(self, inp):
         print('Create a <n> x <m> grid graph as the initial hyperraph.',
               '    grid <n> <m>',
               sep='\n')
 
+    def _generate(self, inp, gen, types, usage_min):
+        """Shared by the generator commands: parse the positional
+        parameters with types and make the result of the generator function
+        named gen the initial hypergraph"""
+        params = Prompt._inp_list_split(inp)
+        if len(params) < usage_min or len(params) > len(types):
+            self.fail('WARNING: invalid usage, see help')
+            return
+        if self.state.hg is not None:
+            self.fail('WARNING: already have hypergraph, '
+                      'ignoring until "reset"')
+            return
+        try:
+            from . import generators  # numpy is slow to import
+            args = [t(p) for t, p in zip(types, params)]
+            self.state.set_initial(getattr(generators, gen)(*args))
+        except Exception as e:
+            self.fail('Error', e)
+            return
+        print('{}: {}'.format(INITIAL_HG_NAME, self.state.hg.summary()))
+
+    def do_uniform(self, inp):
+        self._generate(inp, 'uniform', (int, int, int, int), 3)
+
+    def help_uniform(self):
+        print('Create a random hypergraph with <m> edges of <k> distinct vertices',
+              'out of <n> as the initial hypergraph (needs numpy).',
+              '    uniform <n> <m> <k> [<seed>]',
+              sep='\n')
+
+    def do_powerlaw(self, inp):
+        self._generate(inp, 'power_law',
+                       (int, int, int, float, int), 3)
+
+    def help_powerlaw(self):
+        print('Create a random hypergraph with <m> edges of up to <k> vertices out',
+              'of <n> and power-law degrees (default exponent 2.5, needs numpy).',
+              '    powerlaw <n> <m> <k> [<exponent> [<seed>]]',
+              sep='\n')
+
+    def _grid_shape(s):
+        return tuple(map(int, s.lower().split('x')))
+
+    def do_hypergrid(self, inp):
+        self._generate(inp, 'hypergrid',
+                       (Prompt._grid_shape, int), 1)
+
+    def help_hypergrid(self):
+        print('Create a grid of any dimension where every <k> consecutive vertices',
+              'along an axis form an edge (default 2, needs numpy).',
+              '    hypergrid <n1>x<n2>[x<n3>...] [<k>]',
+              sep='\n')
+
+    def do_torus(self, inp):
+        self._generate(inp, 'torus', (Prompt._grid_shape, int), 1)
+
+    def help_torus(self):
+        print('Like hypergrid, but the edges wrap around (needs numpy).',
+              '    torus <n1>x<n2>[x<n3>...] [<k>]',
+              sep='\n')
+
+    def do_planted(self, inp):
+        self._generate(inp, 'planted',
+                       (int, int, int, int, int, int), 3)
+
+    def help_planted(self):
+        print('Create a random hypergraph with <m> edges of <k> vertices, each',
+              'inside one of <parts> blocks (default 2) plus a separator of',
+              '<sep_size> vertices s0, s1, ... (default n/100, needs numpy).',
+              '    planted <n> <m> <k> [<parts> [<sep_size> [<seed>]]]',
+              sep='\n')
+
     def do_load(self, inp):
         if self.state.hg is not None:
-            print('WARNING: already have hypergraph, ignoring until "reset"')
+            self.fail('WARNING: already have hypergraph, '
+                      'ignoring until "reset"')
             return
         try:
             self.state.load_initial(inp)
             self.do_show('')
         except Exception as e:
-            print('Error loading file:', e)
+            self.fail('Error loading file:', e)
 
     def complete_load(self, text, line, begidx, endidx):
         globstr = '{}*'.format(text)
         return list(glob.glob(globstr))
 
     def help_load(self):
-        print('Load a hypergraph in HyperBench format: load <path>')
+        print('Load a hypergraph in HyperBench format or a binary snapshot: load <path>')
 
     def do_save(self, inp):
         params = inp.split()
         if len(params) < 1 or len(params) > 2:
-            print('WARNING: invalid usage, see help')
+            self.fail('WARNING: invalid usage, see help')
             return
         path = params[0]
         fmt = params[1] if len(params) > 1 else 'hyperbench'
         fmt = fmt.lower()
 
         if self.state.hg is None:
-            print('WARNING: no hypergraph active')
+            self.fail('WARNING: no hypergraph active')
             return
         try:
-            if fmt == 'hyperbench':
-                s = self.state.hg.toHyperbench()
-            elif fmt == 'sc':
-                s = self.state.hg.toVisualSC()
-            elif fmt == 'pace':
-                s = self.state.hg.toPACE()
-            else:
-                print('WARNING: invalid format chosen, see help')
+            if fmt == 'bin':
+                write_snapshot(self.state.hg, path)
+                return
+            writer = FORMATS.get(fmt)
+            if writer is None:
+                self.fail('WARNING: invalid format chosen, see help')
                 return
-            with open(path, 'w') as f:
-                print(s, file=f)
+            with open(path, 'w', buffering=EXPORT_BUFFER) as f:
+                writer(self.state.hg, f)
         except Exception as e:
-            print('Error', e)
+            self.fail('Error', e)
 
     def help_save(self):
-        print('Save the active hypergraph in chosen format (hyperbench (default), sc): save <path> [<format>]')
+        print('Save the active hypergraph in chosen format: save <path> [<format>]',
+              'Formats: hyperbench (default), pace, sc, gr (PACE primal graph),',
+              'csv (incidence edge,vertex pairs), mtx (Matrix Market incidence), bin',
+              sep='\n')
 
     def do_separate(self, inp):
         sep = Prompt._inp_list_split(inp)
@@ -279,12 +610,91 @@ class Prompt(Cmd):
     def help_special(self):
         print('Separate and add separator as special edge to new componenets.')
 
+    def do_balsep(self, inp):
+        if self.state.hg is None:
+            self.fail('No active hypergraph!')
+            return
+        params = Prompt._inp_list_split(inp)
+        if len(params) < 1 or len(params) > 2:
+            self.fail('WARNING: invalid usage, see help')
+            return
+        try:
+            k = int(params[0])
+            limit = int(params[1]) if len(params) > 1 else 10
+        except ValueError as e:
+            self.fail('Error', e)
+            return
+        found = 0
+        for names, sizes in itertools.islice(
+                balanced_separators(self.state.hg, k), limit):
+            found += 1
+            print('{}: {}'.format(' '.join(names) or '(empty)',
+                                  ', '.join(map(str, sizes))))
+        print('Found {} balanced separators'.format(found))
+
+    def help_balsep(self):
+        print('Search separators made of at most <k> edges such that no component',
+              'has more than half of the edges of the active hypergraph.',
+              '    balsep <k> [<max results>]',
+              'Prints the edges of each separator and the edge counts of its',
+              'components. At most 10 separators are shown by default.',
+              sep='\n')
+
+    def do_evalsep(self, inp):
+        if self.state.hg is None:
+            self.fail('No active hypergraph!')
+            return
+        params = inp.split()
+        if len(params) < 1:
+            self.fail('WARNING: invalid usage, see help')
+            return
+        try:
+            if params[0] == 'pairs':
+                candidates = edge_pairs(self.state.hg)
+                rest = params[1:]
+            elif params[0] == 'nbhd':
+                candidates = neighbourhoods(self.state.hg)
+                rest = params[1:]
+            elif params[0] == 'file' and len(params) > 1:
+                candidates = separator_file(self.state.hg, params[1])
+                rest = params[2:]
+            else:
+                self.fail('WARNING: invalid usage, see help')
+                return
+            top = int(rest[0]) if rest else 20
+
+            def progress(seen, best):
+                print('... {} evaluated, best so far: {} (largest {})'.format(
+                    seen, best[0], best[3]), flush=True)
+            best, total = top_separators(
+                evaluate_separators(self.state.hg, candidates), top,
+                progress)
+        except Exception as e:
+            self.fail('Error', e)
+            return
+        print('Evaluated {} separators, best {}:'.format(total, len(best)))
+        print('{:>5} {:>6} {:>8} {:>8}  {}'.format(
+            'bal', '|sep|', '#comps', 'largest', 'separator'))
+        for label, sep_size, comps, largest, balanced in best:
+            print('{:>5} {:>6} {:>8} {:>8}  {}'.format(
+                'yes' if balanced else 'no', sep_size, comps, largest, label))
+
+    def help_evalsep(self):
+        print('Rank candidate separators by balance and number of components,',
+              'evaluated in parallel on all CPU cores. Reports progress every',
+              'second while the results come in.',
+              '    evalsep pairs [<top>]        every pair of edges',
+              '    evalsep nbhd [<top>]         closed neighbourhood of every vertex',
+              '    evalsep file <path> [<top>]  one list of vertices per line',
+              'Shows the best 20 by default.',
+              sep='\n')
+
     def do_comp(self, inp):
         try:
             now = self.state.switch_to_comp(inp)
             print('Using component', now)
         except Exception as e:
-            print('Error:', e)
+            self.fail('Error:', e)
 
     def complete_comp(self, text, line, begidx, endidx):
         return self.state.component_completer(text)
@@ -297,7 +707,7 @@ class Prompt(Cmd):
             now = self.state.pop_comp()
             print('Using component', now)
         except Exception as e:
-            print('Error', e)
+            self.fail('Error', e)
 
     def help_pop(self):
         print('Go back to last hypergraph in history.')
@@ -308,48 +718,232 @@ class Prompt(Cmd):
     def help_hist(self):
         print('Show history of components, most recent at end.')
 
-    def do_show(self, _inp):
-        print(self.state.current_component+':')
-        print(self.state.hg)
+    def do_show(self, inp):
+        if self.state.hg is None:
+            self.fail('No active hypergraph!')
+            return
+        limit = self._show_limit()
+        if inp.strip() == 'all':
+            limit = None
+        elif inp.strip() != '':
+            try:
+                limit = int(inp)
+            except ValueError:
+                self.fail('WARNING: invalid usage, see help')
+                return
+        print('{}: {}'.format(self.state.current_component,
+                              self.state.hg.summary()))
+        self._print_lines(self.state.hg.repr_lines(limit=limit))
 
     def help_show(self):
-        print('Show active hypergraph.')
+        print('Show active hypergraph, at most as many edges as set by "limit":',
+              '    show [<n>|all]',
+              sep='\n')
+
+    def do_limit(self, inp):
+        if inp.strip() == '':
+            print('Showing at most {} edges'.format(self.state.show_limit))
+            return
+        try:
+            self.state.show_limit = None if inp.strip() == 'off' else int(inp)
+        except ValueError:
+            self.fail('WARNING: invalid usage, see help')
+
+    def help_limit(self):
+        print('Set how many edges show, findv and find_edge print:',
+              '    limit [<n>|off]',
+              sep='\n')
+
+    def do_pager(self, inp):
+        if inp.strip() not in ('on', 'off'):
+            print('Pager is', 'on' if self.state.pager else 'off')
+            return
+        self.state.pager = inp.strip() == 'on'
+
+    def help_pager(self):
+        print('Send the output of show, findv and find_edge through $PAGER',
+              '(default "less -R") instead of limiting it:',
+              '    pager [on|off]',
+              sep='\n')
+
+    def do_check(self, inp):
+        if self.state.hg is None:
+            self.fail('No active hypergraph!')
+            return
+        path = inp.strip()
+        if not path:
+            self.fail('WARNING: invalid usage, see help')
+            return
+        try:
+            d = read_htd(path)
+            width, kind, checks = check_decomposition(self.state.hg, d)
+        except (OSError, ValueError) as e:
+            self.fail('Error', e)
+            return
+        for name, count, shown in checks:
+            print('{}: {}'.format(name, 'ok' if count == 0 else
+                                  '{} violations'.format(count)))
+            for msg in shown:
+                print('    ' + msg)
+        print('Width {} (declared {}), {}'.format(
+            _format_width(width), _format_width(d.declared[1]),
+            'valid ' + kind if kind else 'INVALID'))
+    complete_check = complete_load
+
+    def help_check(self):
+        print('Validate a PACE hypertree decomposition (.htd) of the active',
+              'hypergraph, numbered like "save <path> pace", and report its width.',
+              '    check <decomposition file>',
+              sep='\n')
+
+    def do_width(self, inp):
+        if self.state.hg is None:
+            self.fail('No active hypergraph!')
+            return
+        params = inp.split()
+        if len(params) > 2:
+            self.fail('WARNING: invalid usage, see help')
+            return
+        try:
+            budget = float(params[0]) if params else BUDGET
+        except ValueError as e:
+            self.fail('Error', e)
+            return
+        start = time.perf_counter()
+        best_tw, best = None, None
+        for name, tw, ghw, d in width_bounds(self.state.hg, budget):
+            print('{}: treewidth <= {}, ghw <= {} ({:.2f}s)'.format(
+                name, tw, _format_width(ghw), time.perf_counter() - start))
+            best_tw = tw if best_tw is None else min(best_tw, tw)
+            if best is None or ghw <= best[0]:
+                best = (ghw, d)
+        if best is None:
+            return
+        ghw, d = best
+        print('Best: treewidth <= {}, ghw <= {}, {} bags'.format(
+            best_tw, _format_width(ghw), len(d.bags)))
+        if len(params) > 1:
+            try:
+                with open(params[1], 'w', buffering=EXPORT_BUFFER) as f:
+                    write_htd(d, f)
+            except OSError as e:
+                self.fail('Error', e)
+    complete_width = complete_load
+
+    def help_width(self):
+        print('Upper bounds on treewidth and generalized hypertree width from',
+              'min-degree and min-fill elimination orderings with greedy edge',
+              'covers, searched for <seconds> (default {:g}). Optionally writes'.format(BUDGET),
+              'the decomposition with the best ghw bound as .htd (see check).',
+              '    width [<seconds> [<file>]]',
+              sep='\n')
+
+    def do_acyclic(self, inp):
+        if self.state.hg is None:
+            self.fail('No active hypergraph!')
+            return
+        params = inp.split()
+        if len(params) > 1:
+            self.fail('WARNING: invalid usage, see help')
+            return
+        d = self.state.hg.join_tree()
+        if d is None:
+            print('Not acyclic, adding the GYO core:')
+            core = self.state.register_subgraph(self.state.hg.gyo_core())
+            self._output_new_comps([core])
+            return
+        print('Acyclic, join tree with {} bags'.format(len(d.bags)))
+        if params:
+            try:
+                with open(params[0], 'w', buffering=EXPORT_BUFFER) as f:
+                    write_htd(d, f)
+            except OSError as e:
+                self.fail('Error', e)
+    complete_acyclic = complete_load
+
+    def help_acyclic(self):
+        print('Test whether the active hypergraph is alpha-acyclic, in linear time.',
+              'If it is, optionally writes its join tree as a width 1 hypertree',
+              'decomposition (.htd, see check). If not, adds what is left after',
+              'GYO reduction as a new component, the part that needs decomposing.',
+              '    acyclic [<file>]',
+              sep='\n')
+
+    def do_measures(self, inp):
+        if self.state.hg is None:
+            self.fail('No active hypergraph!')
+            return
+        from . import measures  # numpy and scipy are slow to import
+        params = inp.split()
+        if len(params) > 1:
+            self.fail('WARNING: invalid usage, see help')
+            return
+        try:
+            budget = float(params[0]) if params else measures.BUDGET
+            rows = measures.measures(self.state.hg, budget)
+        except (ValueError, RuntimeError) as e:
+            self.fail('Error', e)
+            return
+        for name, value, exact in rows:
+            print('{}: {}'.format(name, _format_measure(value, exact)))
+
+    def help_measures(self):
+        print('Structural measures of the active hypergraph: edge size and degree',
+              'distributions, components of the primal and incidence graph, the',
+              'largest intersections of 2, 3 and 4 edges and the VC dimension.',
+              'The intersections and the VC dimension get <seconds> together',
+              '(default 10) and are reported as bounds if that is not enough.',
+              'Needs numpy and scipy.',
+              '    measures [<seconds>]',
+              sep='\n')
 
     def do_findv(self, inp):
         if self.state.hg is None:
-            print('No active hypergraph!')
+            self.fail('No active hypergraph!')
             return
         hl_list = Prompt._inp_list_split(inp)
-        print(self.state.hg.fancy_repr(hl=hl_list))
+        touching = self.state.hg.edges_touching(hl_list)
+        self._print_lines(self.state.hg.repr_lines(hl_list, touching,
+                                                   self._show_limit()))
     complete_findv = _complete_vertices
 
     def help_findv(self):
-        print('Highlight vertices in active hypergraph: findv <list of vertices>')
+        print('Show the edges incident to the given vertices, with the vertices highlighted:',
+              '    findv <list of vertices>',
+              sep='\n')
 
     def do_find_edge(self, inp):
         if self.state.hg is None:
-            print('No active hypergraph!')
+            self.fail('No active hypergraph!')
             return
         edge_names = Prompt._inp_list_split(inp)
-        edges = [self.state.hg.edge_dict[en] for en in edge_names]
-        hl_list = reduce(lambda a, b: a | b, edges)  # union over all edges
-        print(self.state.hg.fancy_repr(hl=hl_list))
+        try:
+            edges = [self.state.hg.edge_dict[en] for en in edge_names]
+        except KeyError as e:
+            self.fail('Error: no edge', e)
+            return
+        hl_list = reduce(lambda a, b: a | b, edges, set())  # union over all edges
+        touching = self.state.hg.edges_touching(hl_list)
+        self._print_lines(self.state.hg.repr_lines(hl_list, touching,
+                                                   self._show_limit()))
     complete_find_edge = _complete_edge
 
     def help_find_edge(self):
-        print('Highlight all vertices incident to given edges: find_edge <list of edges>')
+        print('Show the edges that meet the given edges, with the vertices of',
+              'the given edges highlighted:',
+              '    find_edge <list of edges>',
+              sep='\n')
 
     def do_edge_subgraph(self, inp):
         if self.state.hg is None:
-            print('No active hypergraph')
+            self.fail('No active hypergraph')
             return
         edge_names = Prompt._inp_list_split(inp)
         try:
             name, hg = self.state.edge_subg(edge_names)
-            print(name)
-            print(hg)
+            print('{}: {}'.format(name, hg.summary()))
         except Exception as e:
-            print('ERROR', e)
+            self.fail('ERROR', e)
     complete_edge_subgraph = _complete_edge
 
     def help_edge_subgraph(self):
@@ -363,17 +957,16 @@ class Prompt(Cmd):
     def do_join(self, inp):
         jv = Prompt._inp_list_split(inp)
         if len(jv) > 2:
-            print('WARNING: takes exactly 2 attributes')
+            self.fail('WARNING: takes exactly 2 attributes')
             return
         if not self.state.ready():
-            print('WARNING: not ready')
+            self.fail('WARNING: not ready')
             return
         try:
             name, hg = self.state.introduce_join(jv[0], jv[1])
-            print(name)
-            print(hg)
+            print('{}: {}'.format(name, hg.summary()))
         except Exception as e:
-            print('ERROR', e)
+            self.fail('ERROR', e)
 
     complete_join = _complete_vertices
 
@@ -382,7 +975,7 @@ class Prompt(Cmd):
             "Joins two vertices of the hypergraph into one.",
             "    join <x> <y>",
             "Vertex <y> becomes <x> in all edges. May introduce",
-            "duplicate edges that are not automatically removed.",
+            "duplicate edges that are not automatically removed, see reduce.",
             sep='\n'
         )
 
@@ -399,26 +992,362 @@ class Prompt(Cmd):
 
     def help_bridge_subg(self):
         print(
-            'Create subgraph from the vertices given as arguments + the bridge sets as special edges.',
-            '    bridge_subgh <list of vertices>',
-            'Bridge sets consist of all the outside part of edges going from',
-            'the new subgraph to the rest of the original graph.',
-            'There is one bridge edge per component of the graph when separated',
-            'by the argument vertices.',
+            'Create subgraph from the edges touching the vertices given as',
+            'arguments + the bridge sets as special edges.',
+            '    bridge_subg <list of vertices>',
+            'There is one bridge set per component of the graph when separated',
+            'by the argument vertices that the subgraph reaches: the outside',
+            'parts of the edges of the subgraph going into that component.',
             sep='\n'
         )
 
+    def do_reduce(self, _inp):
+        if not self.state.ready():
+            self.fail('No active hypergraph!')
+            return
+        try:
+            name, hg, reduction = self.state.reduce()
+        except Exception as e:
+            self.fail('ERROR', e)
+            return
+        print('{}: {}'.format(name, hg.summary()))
+        print('Removed {} duplicate and {} subsumed edges, '
+              'collapsed {} vertices'.format(reduction.duplicates(),
+                                             reduction.subsumed(),
+                                             reduction.collapsed()))
+
+    def help_reduce(self):
+        print('Adds the active hypergraph without duplicate edges and edges',
+              'contained in another edge, and with the vertices that occur',
+              'in only one edge collapsed into one, as <comp>_reduced.',
+              'The generalized hypertree width stays the same.',
+              '    reduce',
+              sep='\n')
+
+    def do_unreduce(self, inp):
+        U = set(Prompt._inp_list_split(inp))
+        try:
+            if U:
+                print(' '.join(sorted(self.state.unreduce_vertices(U))))
+            else:
+                print('Using component', self.state.unreduce())
+        except Exception as e:
+            self.fail('Error:', e)
+
+    complete_unreduce = _complete_vertices
+
+    def help_unreduce(self):
+        print('Switches from a reduced component back to the original:',
+              '    unreduce',
+              'With vertices of the reduced component, lists the vertices of',
+              'the original they stand for, collapsed vertices included:',
+              '    unreduce <list of vertices>',
+              sep='\n')
+
+    def do_cache(self, inp):
+        if inp.strip() == 'clear':
+            self.state.clear_caches()
+            return
+        elif inp.strip() != '':
+            self.fail('WARNING: invalid usage, see help')
+            return
+        for name, size, hits, misses in self.state.cache_stats():
+            print('{}: {} entries, {} hits, {} misses'.format(
+                name, size, hits, misses))
+
+    def help_cache(self):
+        print('Show hit and miss counts of the per-component caches of separations',
+              'and derived structures, or drop all cached entries:',
+              '    cache [clear]',
+              sep='\n')
+
+    def do_profile(self, inp):
+        if not inp.strip():
+            self.fail('WARNING: invalid usage, see help')
+            return
+        import cProfile
+        import pstats
+        tracing = _start_tracing()
+        before = tracemalloc.take_snapshot()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.runcall(self.onecmd, inp)
+        finally:
+            seconds = time.perf_counter() - start
+            after = tracemalloc.take_snapshot()
+            peak = _stop_tracing(tracing)
+        print('--- {:.3f}s, peak traced memory {:.1f} KiB'.format(
+            seconds, peak / 1024))
+        stats = pstats.Stats(profiler, stream=sys.stdout)
+        stats.sort_stats('cumulative').print_stats(PROFILE_TOP)
+        print('Top allocations:')
+        for diff in after.compare_to(before, 'lineno')[:PROFILE_TOP]:
+            print('   ', diff)
+    complete_profile = Cmd.completenames
+
+    def help_profile(self):
+        print('Run a command under cProfile and tracemalloc and show where the time',
+              'and memory went: profile <command>',
+              sep='\n')
+
+    def do_timing(self, inp):
+        inp = inp.strip().lower()
+        if inp == '':
+            print('Timing is', 'on' if self.state.timing else 'off')
+        elif inp in ('on', 'off'):
+            self.state.timing = inp == 'on'
+        else:
+            self.fail('WARNING: invalid usage, see help')
+
+    def help_timing(self):
+        print('Record latency and peak allocation of every command, see stats:',
+              '    timing [on|off]',
+              sep='\n')
+
+    def do_stats(self, inp):
+        if inp.strip() == 'clear':
+            self.state.timings = []
+            return
+        elif inp.strip() != '':
+            self.fail('WARNING: invalid usage, see help')
+            return
+        rows = self.state.timing_stats()
+        if not rows:
+            print('No timings recorded, see timing')
+            return
+        print('{:<16} {:>6} {:>10} {:>10} {:>12}'.format(
+            'command', 'calls', 'total s', 'max s', 'peak KiB'))
+        for command, calls, total, slowest, peak in rows:
+            print('{:<16} {:>6} {:>10.4f} {:>10.4f} {:>12.1f}'.format(
+                command, calls, total, slowest, peak / 1024))
+
+    def help_stats(self):
+        print('Summarise the command timings recorded in this session:',
+              '    stats [clear]',
+              sep='\n')
+
+    def _collect_jobs(self):
+        """Registers the results of finished background jobs"""
+        for job in self.jobs.finished():
+            if job.cancelled:
+                print('[{}] cancelled: {}'.format(job.id, job.command))
+                continue
+            try:
+                result = job.future.result()
+            except Exception as e:
+                print('[{}] Error in {}: {}'.format(job.id, job.command, e))
+                continue
+            print('[{}] done in {:.2f}s: {}'.format(job.id, job.seconds(),
+                                                   job.command))
+            job.done(result)
+
+    def _bg_hypergraph(self):
+        """
+        Copy of the active hypergraph for a job (see Job), or None. It
+        shares the edges with the active one until either is mutated.
+        """
+        hg = self.state.hg
+        return None if hg is None else hg.copy()
+
+    def _bg_separate(self, inp, special=False):
+        hg = self._bg_hypergraph()
+        if hg is None:
+            self.fail('No active hypergraph!')
+            return None
+        sep = set(Prompt._inp_list_split(inp))
+
+        def done(components):
+            new_comps = self.state.register_separation(components, sep,
+                                                       special)
+            self._output_new_comps(new_comps, len(hg.E), special=special)
+        return lambda: hg.separate(sep), done
+
+    def _bg_special(self, inp):
+        return self._bg_separate(inp, special=True)
+
+    def _bg_bridge_subg(self, inp):
+        hg, base = self._bg_hypergraph(), self.state.current_component
+        if hg is None:
+            self.fail('No active hypergraph!')
+            return None
+        C = set(Prompt._inp_list_split(inp))
+
+        def done(nhg):
+            self._output_new_comps([self.state.register_subgraph(nhg, base)])
+        return lambda: hg.bridge_subg(C), done
+
+    def _bg_edge_subgraph(self, inp):
+        hg, base = self._bg_hypergraph(), self.state.current_component
+        if hg is None:
+            self.fail('No active hypergraph')
+            return None
+        edge_names = Prompt._inp_list_split(inp)
+
+        def done(nhg):
+            name, nhg = self.state.register_subgraph(nhg, base,
+                                                     connected=True)
+            print('{}: {}'.format(name, nhg.summary()))
+        return lambda: hg.edge_subg(edge_names), done
+
+    def _bg_load(self, inp):
+        if self.state.hg is not None:
+            self.fail('WARNING: already have hypergraph, '
+                      'ignoring until "reset"')
+            return None
+        path = inp.strip()
+
+        def done(hg):
+            if self.state.hg is None:
+                self.state.set_initial(hg)
+                print('{}: {}'.format(INITIAL_HG_NAME, hg.summary()))
+            else:  # a hypergraph was created in the meantime
+                name, hg = self.state.register_subgraph(
+                    hg, os.path.basename(path))
+                print('{}: {}'.format(name, hg.summary()))
+        return lambda: read_hypergraph(path), done
+
+    _bg_sep = _bg_separate
+    _bg_spec = _bg_special
+
+    def do_bg(self, inp):
+        command, arg, line = self.parseline(inp)
+        job = getattr(self, '_bg_' + command, None) if command else None
+        if job is None:
+            self.fail('WARNING: cannot run >{}< in the background, '
+                      'see help'.format(inp.strip()))
+            return
+        job = job(arg)
+        if job is not None:
+            jid = self.jobs.submit(line, *job)
+            print('[{}] started: {}'.format(jid, line))
+
+    def complete_bg(self, text, line, begidx, endidx):
+        return [c for c in BACKGROUND_COMMANDS if c.startswith(text)]
+
+    def help_bg(self):
+        print('Run a command on a worker thread and keep working meanwhile. Its',
+              'results are added to the components when it is done, see jobs.',
+              '    bg <command>',
+              'Commands: ' + ', '.join(BACKGROUND_COMMANDS),
+              sep='\n')
+
+    def do_jobs(self, _inp):
+        for jid, job in sorted(self.jobs.jobs.items()):
+            print('[{}] {:<9} {:8.2f}s  {}'.format(jid, job.status(),
+                                                   job.seconds(), job.command))
+
+    def help_jobs(self):
+        print('List the background jobs of this session.')
+
+    def _job_ids(self, inp):
+        try:
+            return [int(j.strip('[]%')) for j in inp.split()]
+        except ValueError as e:
+            self.fail('Error', e)
+            return None
+
+    def do_wait(self, inp):
+        jids = self._job_ids(inp)
+        if jids is None:
+            return
+        try:
+            self.jobs.wait(jids or None)
+        except ValueError as e:
+            self.fail('Error', e)
+        except KeyboardInterrupt:
+            print('^C, jobs keep running')
+
+    def help_wait(self):
+        print('Wait for background jobs (default all) to finish.',
+              '    wait [<job id> ...]',
+              sep='\n')
+
+    def do_cancel(self, inp):
+        jids = self._job_ids(inp)
+        if not jids:
+            self.fail('WARNING: invalid usage, see help')
+            return
+        for jid in jids:
+            try:
+                if not self.jobs.cancel(jid):
+                    print('[{}] already running, its result will be '
+                          'discarded'.format(jid))
+            except ValueError as e:
+                self.fail('Error', e)
+
+    def help_cancel(self):
+        print('Cancel background jobs. A job that is already running cannot be',
+              'stopped, its result is discarded instead.',
+              '    cancel <job id> ...',
+              sep='\n')
+
+    def do_save_session(self, inp):
+        path = inp.strip()
+        if not path:
+            self.fail('WARNING: invalid usage, see help')
+            return
+        try:
+            self.state.save_session(path)
+        except (OSError, ValueError) as e:
+            self.fail('Error', e)
+    complete_save_session = complete_load
+
+    def help_save_session(self):
+        print('Save all components, the active one, the history and the',
+              'reductions (see unreduce) as snapshots in a directory, see',
+              'load_session.',
+              '    save_session <directory>',
+              sep='\n')
+
+    def do_load_session(self, inp):
+        if self.state.hg is not None:
+            self.fail('WARNING: already have hypergraph, '
+                      'ignoring until "reset"')
+            return
+        path = inp.strip()
+        if not path:
+            self.fail('WARNING: invalid usage, see help')
+            return
+        try:
+            state = State.load_session(path)
+        except (OSError, ValueError, KeyError) as e:
+            self.fail('Error loading session:', e)
+            return
+        state.show_limit, state.pager = self.state.show_limit, self.state.pager
+        state.timing, state.timings = self.state.timing, self.state.timings
+        self.state = state
+        print(self.state, end='')
+    complete_load_session = complete_load
+
+    def help_load_session(self):
+        print('Restore a session saved with save_session. Components are read from',
+              'their snapshots only when they are used.',
+              '    load_session <directory>',
+              sep='\n')
+
     def do_reset(self, _inp):
+        self.jobs.cancel_all()
         self.state = State()
 
     def help_reset(self):
         print('Resets all state!')
 
     def do_state(self, _inp):
-        pprint.pprint(self.state)
+        print(self.state, end='')
+        usage, total = self.state.memory_usage()
+        print('Memory in KiB (own / shared with other components):')
+        for name, own, shared in usage:
+            print('    {}: {:.1f} / {:.1f}'.format(name, own / 1024,
+                                                   shared / 1024))
+        print('Total: {:.1f} KiB'.format(total / 1024))
+        spilled, size = self.state.components.disk_usage()
+        if spilled:
+            print('On disk: {} components, {:.1f} KiB'.format(spilled,
+                                                              size / 1024))
 
     def help_state(self):
-        print('Show current state.')
+        print('Show current state and the memory used by the components.')
     # Aliases
     do_sep = do_separate
     complete_sep = _complete_vertices
@@ -428,5 +1357,39 @@ class Prompt(Cmd):
     help_spec = help_special
 
 
-if __name__ == "__main__":
-    Prompt().cmdloop()
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='hyperfun', description='REPL Hypergraphs for Fun and Profit')
+    parser.add_argument('files', nargs='*', metavar='FILE',
+                        help='hypergraph to load, several only with --script')
+    parser.add_argument('-s', '--script', metavar='SCRIPT',
+                        help='run the commands in SCRIPT (- for stdin) against '
+                             'every FILE without a terminal and print one JSON '
+                             'record per command')
+    args = parser.parse_args(argv)
+
+    if args.script is not None:
+        from .batch import run_script
+        if args.script == '-':
+            commands = sys.stdin.readlines()
+        else:
+            with open(args.script) as f:
+                commands = f.readlines()
+        return run_script(commands, args.files or [None])
+
+    if len(args.files) > 1:
+        print('WARNING: Use at most one command line argument without --script')
+    import colorama
+    import readline
+    colorama.init()
+    readline.set_completer_delims(' \t\n')  # for proper filename completion
+    prompt = Prompt(*args.files[:1])
+    while True:
+        try:
+            prompt.cmdloop()
+            break
+        except KeyboardInterrupt:
+            # abandon the running command, not the session
+            print('^C')
+            prompt.intro = None
+
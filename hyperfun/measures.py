@@ -0,0 +1,200 @@
+import time
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+    from scipy.sparse.csgraph import connected_components
+except ImportError:  # only the measures need scipy
+    np = sp = None
+
+BUDGET = 10.0  # seconds for the expensive measures together
+BLOCK = 1024  # edges per block of the edge intersection product
+MULTI = (3, 4)  # c of the c-multi-intersection sizes computed
+HISTOGRAM_LIMIT = 12  # distributions with more values are summarised
+
+
+def _require():
+    if sp is None:
+        raise RuntimeError('The measures require numpy and scipy')
+
+
+def incidence_matrix(hg):
+    """
+    (M, vids): M is the sparse CSR edge x vertex incidence matrix of hg, row
+    i the edge hg.csr()[0][i], column j the vertex id vids[j] with vids
+    sorted. Cached until hg is mutated.
+    """
+    _require()
+
+    def build():
+        edge_names, indptr, indices = hg.csr()
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        vids = np.fromiter(sorted(hg.vids), dtype=np.int64,
+                           count=len(hg.vids))
+        column = np.zeros(len(hg.vt), dtype=np.int64)
+        column[vids] = np.arange(len(vids))
+        M = sp.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), column[indices], indptr),
+            shape=(len(edge_names), len(vids)))
+        return M, vids
+    return hg.cache.get(('incidence_matrix',), build)
+
+
+def _distribution(values):
+    """(min, mean, max, {value: count} or None if too many values)"""
+    if len(values) == 0:
+        return 0, 0.0, 0, dict()
+    counts = np.bincount(values)
+    present = np.flatnonzero(counts)
+    hist = None
+    if len(present) <= HISTOGRAM_LIMIT:
+        hist = {int(v): int(counts[v]) for v in present}
+    return int(values.min()), float(values.mean()), int(values.max()), hist
+
+
+def components(M):
+    """Number of connected components of the primal and the incidence graph"""
+    m, n = M.shape
+    if m + n == 0:
+        return 0, 0
+    B = sp.bmat([[None, M], [M.T, None]], format='csr',
+                dtype=np.int32) if m and n else sp.csr_matrix((m + n, m + n))
+    count, labels = connected_components(B, directed=False)
+    return len(np.unique(labels[m:])), count
+
+
+def intersection_width(M, deadline=None):
+    """
+    Largest intersection of two distinct edges, from the products of blocks
+    of BLOCK rows with M^T. Returns (size, exact), a lower bound if the
+    deadline passed first.
+    """
+    MT = M.T.tocsr()
+    best = 0
+    for start in range(0, M.shape[0], BLOCK):
+        if deadline is not None and time.perf_counter() > deadline:
+            return best, False
+        P = (M[start:start + BLOCK] @ MT).tocoo()
+        off = P.row + start != P.col
+        if off.any():
+            best = max(best, int(P.data[off].max()))
+    return best, True
+
+
+def multi_intersection_width(M, c, deadline=None):
+    """
+    Largest intersection of c distinct edges, by a depth first search over
+    sets of increasing edge indices. The intersection sizes of the current
+    vertex set with all edges come from one bincount over the rows of M^T
+    of its vertices, and edges not sharing more than the best size found
+    so far are pruned. Returns (size, exact), a lower bound if the
+    deadline passed first.
+    """
+    m = M.shape[0]
+    if m < c:
+        return 0, True
+    MT = M.T.tocsr()
+    best = 0
+    sizes = np.diff(M.indptr)
+
+    def search(X, last, depth):
+        # X: column indices of the intersection of the chosen edges
+        nonlocal best
+        if deadline is not None and time.perf_counter() > deadline:
+            return False
+        shared = np.bincount(MT[X].indices, minlength=m)
+        shared[:last + 1] = 0
+        cand = np.flatnonzero(shared > best)
+        if depth == 1:
+            if len(cand):
+                best = int(shared[cand].max())
+            return True
+        for k in cand[np.argsort(-shared[cand], kind='stable')]:
+            if shared[k] <= best:
+                break
+            Y = np.intersect1d(X, M.indices[M.indptr[k]:M.indptr[k + 1]],
+                               assume_unique=True)
+            if not search(Y, k, depth - 1):
+                return False
+        return True
+
+    for i in np.argsort(-sizes, kind='stable'):
+        if sizes[i] <= best:
+            break
+        if not search(M.indices[M.indptr[i]:M.indptr[i + 1]], i, c - 1):
+            return best, False
+    return best, True
+
+
+def vc_dimension(M, deadline=None):
+    """
+    (lower, upper) bounds on the VC dimension. A shattered set needs 2^d
+    distinct edges and lies in one edge, which bounds it from above. The
+    lower bound is the largest shattered set grown greedily from each
+    vertex in turn, trying the vertices whose degree splits the edges most
+    evenly first: the trace of every edge on the set is a bit vector, and
+    the set stays shattered while all 2^d of them occur.
+    """
+    m, n = M.shape
+    if m == 0 or n == 0:
+        return 0, 0
+    distinct = len(set(map(tuple, np.split(M.indices, M.indptr[1:-1]))))
+    rank = int(np.diff(M.indptr).max())
+    upper = min(int(np.log2(distinct)), rank)
+    MT = M.T.tocsr()
+    degree = np.diff(MT.indptr)
+    order = np.argsort(np.abs(2 * degree - m), kind='stable')
+    lower = 0
+    for first in order:
+        codes = np.zeros(m, dtype=np.int64)
+        used = np.zeros(n, dtype=bool)
+        d = 0
+        for v in np.concatenate(([first], order)):
+            if used[v]:
+                continue
+            if deadline is not None and time.perf_counter() > deadline:
+                return max(lower, d), upper
+            trial = codes << 1
+            trial[MT.indices[MT.indptr[v]:MT.indptr[v + 1]]] += 1
+            if len(np.unique(trial)) == 2 << d:
+                codes = trial
+                used[v] = True
+                d += 1
+                if d == upper:
+                    return d, upper
+        lower = max(lower, d)
+    return lower, upper
+
+
+def measures(hg, budget=BUDGET):
+    """
+    Structural measures of hg as a list of (measure, value, exact). The
+    cheap ones are exact; intersection widths and the VC dimension share
+    budget seconds and are only bounds (exact False) if their share runs
+    out. A measure finished early leaves its time to the ones after it.
+    """
+    M, vids = incidence_matrix(hg)
+    end = time.perf_counter() + budget
+    sizes = np.diff(M.indptr)
+    degrees = np.diff(M.T.tocsr().indptr)
+    primal, incidence = components(M)
+    rows = [
+        ('vertices', M.shape[1], True),
+        ('edges', M.shape[0], True),
+        ('edge sizes', _distribution(sizes), True),
+        ('degrees', _distribution(degrees), True),
+        ('primal components', primal, True),
+        ('incidence components', incidence, True),
+    ]
+    expensive = [('intersection width', intersection_width)]
+    expensive += [('{}-multi-intersection width'.format(c),
+                   lambda M, deadline, c=c: multi_intersection_width(
+                       M, c, deadline)) for c in MULTI]
+    for i, (name, measure) in enumerate(expensive):
+        now = time.perf_counter()
+        deadline = now + max(end - now, 0) / (len(expensive) + 1 - i)
+        rows.append((name,) + measure(M, deadline))
+    vc = vc_dimension(M, end)
+    rows.append(('VC dimension', vc, vc[0] == vc[1]))
+    return rows
@@ -0,0 +1,44 @@
+from bisect import bisect_left
+
+LIMIT = 200  # completions returned at most
+
+
+class PrefixIndex(object):
+    """
+    Sorted array of names answering prefix queries with two binary
+    searches, so a lookup costs O(log n + results) whatever the size.
+    """
+    __slots__ = ('keys',)
+
+    def __init__(self, names):
+        self.keys = sorted(names)
+
+    def _range(self, prefix):
+        keys = self.keys
+        lo = bisect_left(keys, prefix)
+        if not prefix:
+            return lo, len(keys)
+        # the first string after all strings starting with prefix
+        after = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return lo, bisect_left(keys, after, lo)
+
+    def count(self, prefix):
+        lo, hi = self._range(prefix)
+        return hi - lo
+
+    def complete(self, prefix, limit=LIMIT):
+        """
+        Sorted names starting with prefix, at most limit of them. A cut
+        list ends with the last match, so that the longest common prefix
+        readline inserts is the one of all matches.
+        """
+        lo, hi = self._range(prefix)
+        keys = self.keys
+        if limit is None or hi - lo <= limit:
+            return keys[lo:hi]
+        if limit < 2:
+            return keys[lo:lo + limit]
+        return keys[lo:lo + limit - 1] + [keys[hi - 1]]
+
+    def __len__(self):
+        return len(self.keys)
@@ -0,0 +1,177 @@
+import itertools
+from collections import Counter
+
+
+class Reduction(object):
+    """
+    Log of the steps of reduce_hypergraph, in order, over the ids of the
+    vertex table vt: ('edge', name, vertex ids, kept edge, 'duplicate' or
+    'subsumed') for a removed edge and a superset of it that stays,
+    ('vertices', edge, representative, removed ids) for the vertices of
+    an edge that are in no other edge, collapsed into one.
+    """
+
+    def __init__(self, vt):
+        self.vt = vt
+        self.steps = []
+
+    def duplicates(self):
+        return sum(1 for s in self.steps
+                   if s[0] == 'edge' and s[4] == 'duplicate')
+
+    def subsumed(self):
+        return sum(1 for s in self.steps
+                   if s[0] == 'edge' and s[4] == 'subsumed')
+
+    def collapsed(self):
+        return sum(len(s[3]) for s in self.steps if s[0] == 'vertices')
+
+    def __bool__(self):
+        return bool(self.steps)
+
+    def undo(self, hg):
+        """
+        The hypergraph hg was reduced from, given the reduced one. hg may
+        be over another vertex table than vt, the steps are mapped to it
+        by vertex name.
+        """
+        if hg.vt is self.vt:
+            def own(e):
+                return e
+        else:
+            names = self.vt.names
+
+            def own(e):
+                return hg.vt.intern_edge(names[v] for v in e)
+        edges = dict(hg.edges.items())
+        for step in reversed(self.steps):
+            if step[0] == 'edge':
+                _, name, e, _, _ = step
+                edges[name] = own(e)
+            else:
+                _, name, rep, removed = step
+                edges[name] = tuple(sorted(edges[name] + own(removed)))
+        return _from_edges(hg, edges)
+
+    def expand(self, vids):
+        """
+        The vertex ids vids (of vt) together with the vertices collapsed
+        into them
+        """
+        vids = set(vids)
+        for step in reversed(self.steps):
+            if step[0] == 'vertices' and step[2] in vids:
+                vids.update(step[3])
+        return vids
+
+    def to_json(self):
+        """The steps with vertex names instead of ids, see fromJSON"""
+        names = self.vt.names
+
+        def named(e):
+            return [names[v] for v in e]
+        return [[s[0], s[1], named(s[2]), s[3], s[4]] if s[0] == 'edge'
+                else [s[0], s[1], names[s[2]], named(s[3])]
+                for s in self.steps]
+
+    def fromJSON(steps, vt):
+        """Reduction over vt from the output of to_json"""
+        def ids(e):
+            return tuple(vt.intern(v) for v in e)
+        log = Reduction(vt)
+        for s in steps:
+            if s[0] == 'edge':
+                log.steps.append(('edge', s[1], tuple(sorted(ids(s[2]))),
+                                  s[3], s[4]))
+            else:
+                log.steps.append(('vertices', s[1], vt.intern(s[2]),
+                                  ids(s[3])))
+        return log
+
+
+def _remove_subsumed(edges, log):
+    """
+    Drops every edge contained in another one, of two equal edges the one
+    whose name sorts last. Edges are visited largest first and tested
+    against the kept ones through an inverted index: the kept edges
+    containing an edge are the intersection of the postings of its
+    vertices, rarest vertex first, which is usually empty after a step
+    or two.
+    """
+    order = sorted(edges, key=lambda en: (-len(edges[en]), en))
+    postings = dict()  # vertex id -> names of kept edges containing it
+    kept = []
+    for en in order:
+        e = edges[en]
+        superset = None
+        if not e:
+            superset = kept[0] if kept else None
+        else:
+            lists = [postings.get(v) for v in e]
+            if None not in lists:
+                lists.sort(key=len)
+                common = set(lists[0])
+                for p in lists[1:]:
+                    common.intersection_update(p)
+                    if not common:
+                        break
+                if common:
+                    superset = min(common)
+        if superset is None:
+            kept.append(en)
+            for v in e:
+                if v in postings:
+                    postings[v].add(en)
+                else:
+                    postings[v] = {en}
+        else:
+            kind = ('duplicate' if len(edges[superset]) == len(e)
+                    else 'subsumed')
+            log.steps.append(('edge', en, e, superset, kind))
+    if len(kept) < len(edges):
+        for en in set(edges).difference(kept):
+            del edges[en]
+
+
+def _collapse(edges, log):
+    """
+    Vertices in a single edge are interchangeable, keeps only the smallest
+    of them in every edge.
+    """
+    degree = Counter(itertools.chain.from_iterable(edges.values()))
+    for en in sorted(edges):
+        e = edges[en]
+        private = [v for v in e if degree[v] == 1]
+        if len(private) < 2:
+            continue
+        rep, removed = private[0], tuple(private[1:])
+        gone = set(removed)
+        edges[en] = tuple(v for v in e if v not in gone)
+        log.steps.append(('vertices', en, rep, removed))
+
+
+def reduce_hypergraph(hg):
+    """
+    Returns (reduced, reduction): reduced is hg without duplicate and
+    subsumed edges and with the vertices that occur in only one edge
+    collapsed into one per edge. It has the same generalized hypertree
+    width as hg. reduction records the steps, so that
+    reduction.undo(reduced) rebuilds hg.
+
+    One round of each is enough: removing edges makes no other edge
+    subsumed, and an edge that lost vertices keeps one that is in no
+    other edge, so it cannot become subsumed either.
+    """
+    edges = dict(hg.edges.items())
+    log = Reduction(hg.vt)
+    _remove_subsumed(edges, log)
+    _collapse(edges, log)
+    return _from_edges(hg, edges), log
+
+
+def _from_edges(hg, edges):
+    """Hypergraph sharing the vertex table of hg with the dict edges"""
+    h = hg._derived()
+    h.edges = edges
+    h._vids = None  # computed from the edges when needed
+    return h
@@ -0,0 +1,118 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from .hypergraph import HyperGraph
+
+# Layout, all integers little-endian, sections 8-byte aligned:
+#   magic, header (vertex count, edge count, incidence count,
+#   byte length of vertex name table, byte length of edge name table),
+#   indptr (edge count + 1) x uint64, indices (incidence count) x uint32,
+#   vertex names and edge names as utf-8, separated by NUL bytes.
+MAGIC = b'HFUNSNP1'
+_HEADER = struct.Struct('<5Q')
+_NAME_SEP = '\0'
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _layout(n_edges, n_inc, vbytes, ebytes):
+    """Offsets of the sections and total file size"""
+    indptr_at = len(MAGIC) + _HEADER.size
+    indices_at = indptr_at + 8 * (n_edges + 1)
+    vnames_at = _align(indices_at + 4 * n_inc)
+    enames_at = vnames_at + vbytes
+    return indptr_at, indices_at, vnames_at, enames_at, enames_at + ebytes
+
+
+def _little_endian(arr):
+    if sys.byteorder == 'big':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+def _join_names(names):
+    s = _NAME_SEP.join(names)
+    if s.count(_NAME_SEP) != max(len(names) - 1, 0):
+        raise ValueError('Names must not contain NUL characters')
+    return s.encode('utf-8')
+
+
+def is_snapshot(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_snapshot(hg, path):
+    """
+    Writes to a temporary file renamed over path, so that a snapshot is
+    never rewritten in place while it is being read
+    """
+    edge_names, indptr, indices = hg.csr()
+    vids = sorted(hg.vids)
+    if vids != list(range(len(vids))):
+        # derived graphs share the vertex table of their parent,
+        # number their vertices compactly
+        local = {v: i for i, v in enumerate(vids)}
+        indices = map(local.__getitem__, indices)
+    vnames = _join_names([hg.vt.names[v] for v in vids])
+    enames = _join_names(edge_names)
+    indptr = _little_endian(array('Q', indptr))
+    indices = _little_endian(array('I', indices))
+
+    indptr_at, indices_at, vnames_at, enames_at, size = _layout(
+        len(edge_names), len(indices), len(vnames), len(enames))
+    tmp = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        with open(tmp, 'w+b') as f:
+            f.truncate(size)
+            with mmap.mmap(f.fileno(), size) as mm:
+                mm[:len(MAGIC)] = MAGIC
+                _HEADER.pack_into(mm, len(MAGIC), len(vids), len(edge_names),
+                                  len(indices), len(vnames), len(enames))
+                mm[indptr_at:indices_at] = indptr
+                mm[indices_at:indices_at + 4 * len(indices)] = indices
+                mm[vnames_at:enames_at] = vnames
+                mm[enames_at:size] = enames
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def read_snapshot(path, vt=None):
+    """
+    Load a snapshot written by write_snapshot, with its vertex names
+    interned into the VertexTable vt if given (see HyperGraph.fromCSR).
+    The CSR arrays are copied out of the memory-mapped file in one piece
+    each, the file is not used afterwards.
+    """
+    with open(path, 'rb') as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError('{} is not a hyperfun snapshot'.format(path))
+        n_vertices, n_edges, n_inc, vbytes, ebytes = _HEADER.unpack_from(
+            mm, len(MAGIC))
+        indptr_at, indices_at, vnames_at, enames_at, size = _layout(
+            n_edges, n_inc, vbytes, ebytes)
+        if len(mm) < size:
+            raise ValueError('Snapshot {} is truncated'.format(path))
+
+        indptr = array('Q')
+        indptr.frombytes(mm[indptr_at:indices_at])
+        indices = array('I')
+        indices.frombytes(mm[indices_at:indices_at + 4 * n_inc])
+        vnames = str(mm[vnames_at:enames_at], 'utf-8').split(_NAME_SEP)
+        enames = str(mm[enames_at:size], 'utf-8').split(_NAME_SEP)
+    indptr = _little_endian(indptr)
+    indices = _little_endian(indices)
+    if n_vertices == 0:
+        vnames = []
+    if n_edges == 0:
+        enames = []
+    return HyperGraph.fromCSR(vnames, enames, indptr, indices, vt)
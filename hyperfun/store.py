@@ -0,0 +1,202 @@
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from .hypergraph import VertexTable
+from .prefix import PrefixIndex
+from .snapshot import read_snapshot, write_snapshot
+
+RESIDENT = 8  # components kept in memory
+MANIFEST = 'session.json'
+MANIFEST_VERSION = 1
+_SNAP_RE = re.compile(r'\d{6}\.snap$')
+
+
+class ComponentStore(MutableMapping):
+    """
+    Component name -> HyperGraph. At most resident components are kept in
+    memory, least recently used first out; evicted components are written
+    as binary snapshots to a spill directory and read back (memory
+    mapped) on access, into the vertex table they had when stored, so
+    ids stay comparable with the other components. A snapshot is only
+    written again if its component was mutated since. Evicted objects
+    are not updated by the store: look components up by name instead of
+    holding on to them.
+    """
+
+    def __init__(self, resident=RESIDENT):
+        self.resident = resident
+        self._names = dict()  # name -> summary, in insertion order
+        self._memory = OrderedDict()  # least recently used first
+        self._paths = dict()  # name -> snapshot file
+        self._versions = dict()  # name -> hg._version its snapshot shows
+        self._tables = dict()  # name -> VertexTable
+        self._spill_dir = None
+        self._spilled = 0
+        self._index = None  # PrefixIndex of the names, built on demand
+
+    def __getitem__(self, name):
+        if name in self._memory:
+            self._memory.move_to_end(name)
+            return self._memory[name]
+        if name not in self._paths:
+            raise KeyError(name)
+        hg = read_snapshot(self._paths[name], self._tables[name])
+        self._versions[name] = hg._version
+        self._keep(name, hg)
+        return hg
+
+    def __setitem__(self, name, hg):
+        self._drop_snapshot(name)
+        if name not in self._names:
+            self._index = None
+        self._names[name] = hg.summary()
+        self._tables[name] = hg.vt
+        self._keep(name, hg)
+
+    def __delitem__(self, name):
+        del self._names[name]
+        self._index = None
+        self._memory.pop(name, None)
+        self._drop_snapshot(name)
+        self._tables.pop(name, None)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def summary(self, name):
+        """hg.summary() of a component without loading it"""
+        if name in self._memory:
+            return self._memory[name].summary()
+        return self._names[name]
+
+    def vertex_table(self, name):
+        """VertexTable of a component without loading it"""
+        return self._tables[name]
+
+    def name_index(self):
+        if self._index is None:
+            self._index = PrefixIndex(self._names)
+        return self._index
+
+    def is_resident(self, name):
+        return name in self._memory
+
+    def resident_items(self):
+        """(name, hg) of the components in memory, without loading any"""
+        return [(name, self._memory[name])
+                for name in self._names if name in self._memory]
+
+    def disk_usage(self):
+        """(components only on disk, bytes of their snapshots)"""
+        spilled = [p for name, p in self._paths.items()
+                   if name not in self._memory]
+        return len(spilled), sum(os.path.getsize(p) for p in spilled)
+
+    def _on_disk(self, name):
+        """Snapshot file that is up to date with the component, or None"""
+        path = self._paths.get(name)
+        hg = self._memory.get(name)
+        if hg is not None and hg._version != self._versions.get(name):
+            return None
+        return path
+
+    def _keep(self, name, hg):
+        self._memory[name] = hg
+        self._memory.move_to_end(name)
+        while len(self._memory) > self.resident:
+            old, old_hg = next(iter(self._memory.items()))
+            if self._on_disk(old) is None:
+                self._drop_snapshot(old)
+                self._paths[old] = self._spill(old_hg)
+                self._versions[old] = old_hg._version
+                self._names[old] = old_hg.summary()
+            del self._memory[old]
+
+    def _drop_snapshot(self, name):
+        """
+        Forgets the snapshot of a component, removing the file if it is
+        a spill file; snapshots of a loaded session stay.
+        """
+        path = self._paths.pop(name, None)
+        self._versions.pop(name, None)
+        if path is not None and self._spill_dir is not None and (
+                os.path.dirname(path) == self._spill_dir):
+            os.remove(path)
+
+    def _spill(self, hg):
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='hyperfun-')
+            weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+        self._spilled += 1
+        path = os.path.join(self._spill_dir, '{:06d}.snap'.format(
+            self._spilled))
+        write_snapshot(hg, path)
+        return path
+
+    def save(self, directory, extra):
+        """
+        Writes every component as a snapshot to directory, together with
+        a manifest of the component names and the JSON object extra.
+        Components already on disk are copied without loading them, or
+        left in place if they are in directory already. Snapshots of an
+        earlier save there that are no longer part of the session are
+        removed.
+        """
+        os.makedirs(directory, exist_ok=True)
+        directory = os.path.abspath(directory)
+        existing = set(f for f in os.listdir(directory) if _SNAP_RE.match(f))
+        used = set()
+        fresh = (f for f in map('{:06d}.snap'.format, itertools.count())
+                 if f not in existing)
+        entries = []
+        for name in self._names:
+            src = self._on_disk(name)
+            if src is not None and os.path.dirname(
+                    os.path.abspath(src)) == directory:
+                fname = os.path.basename(src)
+            else:
+                fname = next(fresh)
+                path = os.path.join(directory, fname)
+                if src is None:
+                    write_snapshot(self._memory[name], path)
+                else:
+                    shutil.copyfile(src, path)
+            used.add(fname)
+            entries.append([name, fname, self.summary(name)])
+        manifest = dict(extra, version=MANIFEST_VERSION, components=entries)
+        tmp = os.path.join(directory, MANIFEST + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp, os.path.join(directory, MANIFEST))
+        for fname in existing - used:
+            os.remove(os.path.join(directory, fname))
+
+    def load(directory, resident=RESIDENT):
+        """
+        Store over the snapshots of a session saved with save, and the
+        extra object. Nothing is read until a component is accessed; the
+        components share one new vertex table.
+        """
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError('{} is not a hyperfun session'.format(directory))
+        store = ComponentStore(resident)
+        vt = VertexTable()
+        for name, fname, summary in manifest.pop('components'):
+            store._names[name] = summary
+            store._paths[name] = os.path.join(directory, fname)
+            store._tables[name] = vt
+        return store, manifest
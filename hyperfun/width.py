@@ -0,0 +1,254 @@
+import heapq
+import random
+import time
+from .export import edge_order
+from .htd import Decomposition
+
+BUDGET = 5.0  # seconds
+RUNS = 50  # heuristic runs at most, random tie-breaking after the first two
+
+
+def primal_adjacency(hg):
+    """Vertex id -> set of neighbour ids in the primal graph"""
+    adj = {v: set() for v in hg.vids}
+    for e in hg.edges.values():
+        for v in e:
+            adj[v].update(e)
+    for v, nb in adj.items():
+        nb.discard(v)
+    return adj
+
+
+def _fill_in(adj):
+    """Vertex -> number of non-adjacent pairs of its neighbours"""
+    fill = dict()
+    for v, nb in adj.items():
+        d = len(nb)
+        inside = sum(len(nb & adj[x]) for x in nb) // 2
+        fill[v] = d * (d - 1) // 2 - inside
+    return fill
+
+
+def degeneracy(adj):
+    """
+    Largest minimum degree while repeatedly deleting a vertex of minimum
+    degree, a lower bound on the treewidth
+    """
+    degree = {v: len(nb) for v, nb in adj.items()}
+    heap = [(d, v) for v, d in degree.items()]
+    heapq.heapify(heap)
+    best = 0
+    while heap:
+        d, v = heapq.heappop(heap)
+        if v not in degree or d != degree[v]:
+            continue
+        best = max(best, d)
+        del degree[v]
+        for u in adj[v]:
+            if u in degree:
+                degree[u] -= 1
+                heapq.heappush(heap, (degree[u], u))
+    return best
+
+
+def eliminate(adj, min_fill=False, deadline=None, bound=None, rng=None):
+    """
+    Greedy elimination ordering of the graph adj (vertex -> neighbour set,
+    consumed). Picks a vertex of minimum degree, or minimum fill-in with
+    min_fill, from a heap with lazy deletion; the fill-in of the affected
+    vertices is updated with every fill edge instead of being recomputed.
+    Ties are broken by vertex id, or randomly with rng.
+
+    Returns (width, order, neighbours) with the neighbours of every vertex
+    when it was eliminated, or None if the deadline passed or the width
+    exceeded bound.
+    """
+    fill = _fill_in(adj) if min_fill else None
+
+    def key(v):
+        return fill[v] if min_fill else len(adj[v])
+
+    def tie(v):
+        return rng.random() if rng is not None else v
+    heap = [(key(v), tie(v), v) for v in adj]
+    heapq.heapify(heap)
+    order = []
+    neighbours = dict()
+    width = 0
+    while heap:
+        k, _, v = heapq.heappop(heap)
+        if v not in adj or k != key(v):
+            continue  # eliminated or outdated entry
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+        nb = adj.pop(v)
+        if bound is not None and len(nb) > bound:
+            return None
+        width = max(width, len(nb))
+        order.append(v)
+        neighbours[v] = tuple(nb)
+        changed = set(nb)
+
+        # make the neighbourhood a clique
+        nbl = list(nb)
+        for i, x in enumerate(nbl):
+            ax = adj[x]
+            for y in nbl[i + 1:]:
+                if y in ax:
+                    continue
+                ay = adj[y]
+                if min_fill:
+                    # x, y stop being a missing pair of their common
+                    # neighbours, and form new ones with the others
+                    common = ax & ay
+                    for w in common:
+                        fill[w] -= 1
+                    changed.update(common)
+                    fill[x] += sum(1 for z in ax if z not in ay)
+                    fill[y] += sum(1 for z in ay if z not in ax)
+                ax.add(y)
+                ay.add(x)
+        for u in nb:
+            au = adj[u]
+            au.discard(v)
+            if min_fill:
+                # pairs of v with the neighbours of u outside the clique
+                fill[u] -= sum(1 for z in au if z not in nb)
+        for u in changed:
+            heapq.heappush(heap, (key(u), tie(u), u))
+    return width, order, neighbours
+
+
+def edge_cover(hg, bag):
+    """Greedy set cover of the vertex ids in bag by edge names"""
+    uncovered = set(bag)
+    heap = [(-len(uncovered.intersection(hg.edges[en])), en)
+            for en in hg._touching_ids(bag)]
+    heapq.heapify(heap)
+    cover = []
+    while uncovered and heap:
+        gain, en = heapq.heappop(heap)
+        now = len(uncovered.intersection(hg.edges[en]))
+        if now == 0:
+            continue
+        if -gain != now:
+            heapq.heappush(heap, (-now, en))
+            continue
+        cover.append(en)
+        uncovered.difference_update(hg.edges[en])
+    if uncovered:  # only vertices without edges, there are none
+        raise ValueError('Vertices {} are in no edge'.format(
+            hg.vt.to_names(uncovered)))
+    return cover
+
+
+def _edge_numbers(hg):
+    return {en: i for i, en in enumerate(edge_order(hg), start=1)}
+
+
+def decomposition(hg, order, neighbours):
+    """
+    Tree decomposition of the elimination ordering with a greedy edge cover
+    of every bag, numbered for write_htd. The bag of v is v and its
+    neighbours at elimination, its parent the bag of the neighbour p that
+    is eliminated first. The neighbours of v are p and a subset of those
+    of p, so the bag of p is contained in the bag of v exactly when v has
+    one neighbour more than p; such bags are merged into their child
+    before covering. Bags of different components are chained.
+    """
+    number = hg.vertex_numbering()
+    edge_number = _edge_numbers(hg)
+    pos = {v: i for i, v in enumerate(order)}
+    parent = {v: min(neighbours[v], key=pos.__getitem__, default=None)
+              for v in order}
+    absorbed_by = dict()
+    for v in order:
+        p = parent[v]
+        if (p is not None and p not in absorbed_by
+                and len(neighbours[v]) == len(neighbours[p]) + 1):
+            absorbed_by[p] = v
+
+    def resolve(v):
+        while v in absorbed_by:
+            v = absorbed_by[v]
+        return v
+
+    d = Decomposition()
+    bag_id = dict()
+    last_root = None
+    for v in order:
+        if v in absorbed_by:
+            continue
+        b = bag_id[v] = len(bag_id) + 1
+        bag = (v,) + neighbours[v]
+        d.bags[b] = set(number[u] for u in bag)
+        d.cover[b] = {edge_number[en]: 1 for en in edge_cover(hg, bag)}
+    for v, b in bag_id.items():
+        p = parent[v]
+        while p is not None and resolve(p) == v:
+            p = parent[p]
+        if p is not None:
+            d.tree.append((b, bag_id[resolve(p)]))
+        else:
+            if last_root is not None:
+                d.tree.append((last_root, b))
+            last_root = b
+    d.declared = (len(d.bags), d.width(), len(number), len(edge_number))
+    return d
+
+
+def _trivial(hg):
+    """One bag with all vertices, the starting point of width_bounds"""
+    number = hg.vertex_numbering()
+    edge_number = _edge_numbers(hg)
+    d = Decomposition()
+    d.bags[1] = set(number.values())
+    d.cover[1] = {edge_number[en]: 1 for en in edge_cover(hg, hg.vids)}
+    d.declared = (1, d.width(), len(number), len(edge_number))
+    return d
+
+
+def width_bounds(hg, budget=BUDGET, seed=0):
+    """
+    Yields (heuristic, treewidth bound, ghw bound, decomposition) for every
+    improvement found within budget seconds: min-degree and min-fill
+    first, then both again with random tie-breaking until the time is up,
+    RUNS heuristic runs are done or the treewidth bound meets the
+    degeneracy lower bound. The first result is the trivial decomposition
+    with a single bag, so there is always a best-so-far result.
+    """
+    if not hg.vids:
+        return
+    deadline = time.perf_counter() + budget
+    adj = primal_adjacency(hg)
+    lower = degeneracy(adj)
+    d = _trivial(hg)
+    best_tw, best_ghw = len(adj) - 1, d.width()
+    yield 'single bag', best_tw, best_ghw, d
+
+    rng = random.Random(seed)
+    runs = [('min-degree', False, None), ('min-fill', True, None)]
+    attempt = 0
+    while (time.perf_counter() < deadline and attempt < RUNS
+           and best_tw > lower):
+        if attempt < len(runs):
+            name, min_fill, r = runs[attempt]
+        else:
+            min_fill = attempt % 2 == 1
+            name = 'min-fill' if min_fill else 'min-degree'
+            name += ' (random ties)'
+            r = rng
+        attempt += 1
+        res = eliminate({v: set(nb) for v, nb in adj.items()}, min_fill,
+                        deadline, best_tw if r is not None else None, r)
+        if res is None:
+            continue
+        tw, order, neighbours = res
+        if tw > best_tw and r is not None:
+            continue
+        d = decomposition(hg, order, neighbours)
+        ghw = d.width()
+        if tw < best_tw or ghw < best_ghw:
+            best_tw = min(tw, best_tw)
+            best_ghw = min(ghw, best_ghw)
+            yield name, tw, ghw, d
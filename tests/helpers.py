@@ -0,0 +1,42 @@
+import random
+from hyperfun.hypergraph import HyperGraph
+
+
+def random_hypergraph(seed, n=10, m=10, k=4):
+    """m edges of 1 to k of n vertices, named e0, e1, ... and v0, v1, ..."""
+    rng = random.Random(seed)
+    hg = HyperGraph()
+    for i in range(m):
+        size = rng.randint(1, k)
+        hg.add_edge(set('v{}'.format(v) for v in rng.sample(range(n), size)),
+                    'e{}'.format(i))
+    return hg
+
+
+def random_acyclic(seed, m=12):
+    """Every edge shares a subset of one earlier edge, plus new vertices"""
+    rng = random.Random(seed)
+    hg = HyperGraph()
+    edges = [set(['v0', 'v1'])]
+    fresh = 2
+    for i in range(1, m):
+        parent = sorted(rng.choice(edges))
+        e = set(rng.sample(parent, rng.randint(0, len(parent))))
+        for _ in range(rng.randint(0 if e else 1, 3)):
+            e.add('v{}'.format(fresh))
+            fresh += 1
+        edges.append(e)
+    for i, e in enumerate(edges):
+        hg.add_edge(e, 'e{}'.format(i))
+    return hg
+
+
+def named_edges(hg):
+    """Edge name -> set of vertex names, comparable across vertex tables"""
+    return {en: hg.vt.to_names(e) for en, e in hg.edges.items()}
+
+
+def run_command(prompt, line):
+    """Runs line through prompt as the command loop does, hooks included"""
+    prompt.onecmd(prompt.precmd(line))
+    prompt.postcmd(False, line)
@@ -0,0 +1,59 @@
+from hyperfun.htd import check_decomposition
+from hyperfun.hypergraph import HyperGraph
+from tests.helpers import random_acyclic, random_hypergraph
+
+
+def _gyo_acyclic(hg):
+    """Plain GYO reduction on vertex name sets"""
+    edges = [set(e) for e in hg.E]
+    changed = True
+    while changed:
+        changed = False
+        for e in edges:
+            lonely = set(v for v in e
+                         if sum(v in f for f in edges) == 1)
+            if lonely:
+                e -= lonely
+                changed = True
+        for i, e in enumerate(edges):
+            if any(j != i and e <= f for j, f in enumerate(edges)):
+                del edges[i]
+                changed = True
+                break
+    return all(not e for e in edges)
+
+
+def _graphs():
+    for seed in range(100):
+        yield random_hypergraph(seed, n=10, m=seed % 8 + 1, k=4)
+        yield random_acyclic(seed)
+    yield HyperGraph.grid(1, 5)
+    yield HyperGraph.grid(3, 3)
+
+
+def test_acyclic_matches_gyo():
+    acyclic = 0
+    for hg in _graphs():
+        expected = _gyo_acyclic(hg)
+        assert hg.is_acyclic() == expected
+        assert (len(hg.gyo_core().edges) == 0) == expected
+        acyclic += expected
+    assert 100 < acyclic < 202
+
+
+def test_join_tree_is_a_width_1_hd():
+    for hg in _graphs():
+        d = hg.join_tree()
+        if d is not None:
+            width, kind, _ = check_decomposition(hg, d)
+            assert (width, kind) == (1, 'HD')
+
+
+def test_triangle():
+    hg = HyperGraph()
+    hg.add_edge({'a', 'b'}, 'x')
+    hg.add_edge({'b', 'c'}, 'y')
+    hg.add_edge({'a', 'c'}, 'z')
+    assert not hg.is_acyclic()
+    hg.add_edge({'a', 'b', 'c'}, 'all')
+    assert hg.is_acyclic()
@@ -0,0 +1,54 @@
+import itertools
+import pytest
+from hyperfun.balsep import (balanced_separators, candidate_edges,
+                             component_sizes)
+from hyperfun.hypergraph import HyperGraph
+from tests.helpers import random_hypergraph
+
+
+def _balanced(hg, sep):
+    return all(s <= len(hg.edges) / 2 for s in component_sizes(hg, sep))
+
+
+def _minimal_balanced(hg, k):
+    """Vertex sets of the inclusion-minimal balanced unions of <= k edges"""
+    cands = candidate_edges(hg)
+    found = set()
+    for size in range(1, k + 1):
+        for combo in itertools.combinations(cands, size):
+            sep = frozenset().union(*(hg.edges[en] for en in combo))
+            if not _balanced(hg, sep):
+                continue
+            if any(_balanced(hg, frozenset().union(
+                    *(hg.edges[en] for en in sub)))
+                   for r in range(1, size)
+                   for sub in itertools.combinations(combo, r)):
+                continue
+            found.add(sep)
+    return found
+
+
+@pytest.mark.parametrize('seed', range(100))
+@pytest.mark.parametrize('n, m, k', [(12, 9, 3), (20, 16, 3)])
+def test_finds_every_minimal_balanced_separator(seed, n, m, k):
+    hg = random_hypergraph(seed, n, m, k)
+    results = list(balanced_separators(hg, 3))
+    if _balanced(hg, frozenset()):
+        assert results == [((), component_sizes(hg, frozenset()))]
+        return
+    seps = [frozenset().union(*(hg.edges[en] for en in names))
+            for names, sizes in results]
+    assert len(seps) == len(set(seps))
+    for (names, sizes), sep in zip(results, seps):
+        assert 1 <= len(names) <= 3
+        assert sizes == component_sizes(hg, sep)
+        assert _balanced(hg, sep)
+    assert _minimal_balanced(hg, 3) <= set(seps)
+
+
+def test_grid():
+    hg = HyperGraph.grid(4, 4)
+    assert not list(balanced_separators(hg, 1))
+    results = list(balanced_separators(hg, 2))
+    assert results
+    assert all(max(sizes) <= 12 for names, sizes in results)
@@ -0,0 +1,29 @@
+import io
+import json
+from hyperfun.batch import run_script
+
+
+def _records(tmp_path, text, commands):
+    path = str(tmp_path / 'in.hg')
+    with open(path, 'w') as f:
+        f.write(text)
+    out = io.StringIO()
+    status = run_script(commands, [path], out)
+    return status, [json.loads(l) for l in out.getvalue().splitlines()]
+
+
+def test_output_looking_like_errors_is_ok(tmp_path):
+    status, records = _records(tmp_path, 'Error(WARNING,b),\nx(b,c).\n',
+                               ['show', 'findv WARNING'])
+    assert status == 0
+    assert all(r['ok'] for r in records)
+    assert 'Error' in records[1]['output']
+
+
+def test_failures(tmp_path):
+    status, records = _records(tmp_path, 'e(a,b).\n',
+                               ['nonsense', 'limit x', 'show'])
+    assert status == 1
+    assert [r['ok'] for r in records] == [True, False, False, True]
+    assert records[1]['error'] == 'Unknown syntax: nonsense'
+    assert records[2]['error'].startswith('WARNING')
@@ -0,0 +1,22 @@
+from hyperfun.corpus import process_file
+
+
+def _write(tmp_path, text):
+    path = str(tmp_path / 'in.hg')
+    with open(path, 'w') as f:
+        f.write(text)
+    return path
+
+
+def test_every_record_says_whether_acyclic(tmp_path):
+    path = _write(tmp_path, 'a(x,y),\nb(y,z).\n')
+    assert process_file(path)['acyclic'] is True
+    assert process_file(path, reduce=True)['acyclic'] is True
+    assert 'separator' not in process_file(path, balsep=1)
+
+
+def test_separator_of_cyclic_file(tmp_path):
+    path = _write(tmp_path, 'a(x,y),\nb(y,z),\nc(z,x).\n')
+    assert process_file(path)['acyclic'] is False
+    record = process_file(path, balsep=2)
+    assert record['acyclic'] is False and 'separator' in record
@@ -0,0 +1,35 @@
+from hyperfun.evaluate import (edge_pairs, evaluate_separators, rank_key,
+                               top_separators)
+from tests.helpers import random_hypergraph
+
+
+def _sequential(hg, candidates):
+    results = []
+    for label, sep in candidates:
+        comps = hg.separate(hg.vt.to_names(sep))
+        sizes = [len(C.edges) for C in comps if len(C.edges) > 0]
+        largest = max(sizes, default=0)
+        results.append((label, len(sep), len(sizes), largest,
+                        largest <= len(hg.edges) / 2))
+    return sorted(results, key=rank_key)
+
+
+def test_ranking_matches_sequential_separate():
+    for seed in range(3):
+        hg = random_hypergraph(seed, n=12, m=8, k=3)
+        candidates = list(edge_pairs(hg))
+        best, seen = top_separators(
+            evaluate_separators(hg, candidates, processes=1), 10)
+        assert seen == len(candidates)
+        assert best == _sequential(hg, candidates)[:10]
+
+
+def test_progress_reports_best_so_far():
+    hg = random_hypergraph(1, n=12, m=8, k=3)
+    candidates = list(edge_pairs(hg))
+    reports = []
+    best, seen = top_separators(
+        evaluate_separators(hg, candidates, processes=1), 3,
+        lambda n, r: reports.append((n, r)), interval=0)
+    assert [n for n, _ in reports] == list(range(1, seen + 1))
+    assert reports[-1][1] == best[0]
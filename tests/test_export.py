@@ -0,0 +1,78 @@
+import io
+from hyperfun.export import FORMATS, edge_order
+from hyperfun.hyperbench import parse_chunks
+from tests.helpers import named_edges, random_hypergraph
+
+
+def _graphs():
+    for seed in range(10):
+        yield random_hypergraph(seed, n=15, m=seed + 1, k=5)
+
+
+def _export(hg, fmt):
+    f = io.StringIO()
+    FORMATS[fmt](hg, f)
+    return f.getvalue()
+
+
+def _by_number(hg):
+    names = dict()
+    for v, i in hg.vertex_numbering().items():
+        names[i] = hg.vt.names[v]
+    return names
+
+
+def test_hyperbench_round_trip():
+    for hg in _graphs():
+        text = _export(hg, 'hyperbench')
+        edges = {en: set(e) for en, e in parse_chunks([text])}
+        assert edges == named_edges(hg)
+
+
+def test_pace_round_trip():
+    for hg in _graphs():
+        lines = _export(hg, 'pace').splitlines()
+        assert lines[0] == 'p htd {} {}'.format(len(hg.vids), len(hg.edges))
+        names = _by_number(hg)
+        edges = dict()
+        for en, (i, line) in zip(edge_order(hg), enumerate(lines[1:], 1)):
+            number, *vertices = line.split()
+            assert int(number) == i
+            edges[en] = set(names[int(v)] for v in vertices)
+        assert len(lines) == len(hg.edges) + 1
+        assert edges == named_edges(hg)
+
+
+def test_other_formats():
+    for hg in _graphs():
+        n, m = len(hg.vids), len(hg.edges)
+        nnz = sum(len(e) for e in hg.edges.values())
+        primal = set((u, w) for e in hg.edges.values()
+                     for u in e for w in e if u < w)
+
+        sc = _export(hg, 'sc')
+        assert sc.endswith('\n') and sc.count('{') == sc.count('}') == m
+
+        gr = _export(hg, 'gr').splitlines()
+        assert gr[0] == 'p tw {} {}'.format(n, len(primal))
+        assert len(gr) == len(primal) + 1
+
+        rows = _export(hg, 'csv').splitlines()
+        assert rows[0] == 'edge,vertex'
+        assert len(rows) == nnz + 1
+
+        mtx = _export(hg, 'mtx').splitlines()
+        assert mtx[0] == '%%MatrixMarket matrix coordinate pattern general'
+        assert mtx[1] == '{} {} {}'.format(m, n, nnz)
+        assert len(mtx) == nnz + 2
+
+
+def test_numbering_is_stable():
+    for hg in _graphs():
+        order, numbering = edge_order(hg), dict(hg.vertex_numbering())
+        first = {fmt: _export(hg, fmt) for fmt in FORMATS}
+        assert {fmt: _export(hg, fmt) for fmt in FORMATS} == first
+        assert edge_order(hg) == order
+        assert hg.vertex_numbering() == numbering
+        assert edge_order(hg.copy()) == order
+        assert hg.copy().vertex_numbering() == numbering
@@ -0,0 +1,16 @@
+import pytest
+
+pytest.importorskip('numpy')
+from hyperfun.generators import planted  # noqa: E402
+
+
+@pytest.mark.parametrize('n, m, k, parts, sep_size', [
+    (20, 3, 2, 3, 5), (12, 5, 3, 4, 6), (100, 50, 3, 5, None),
+    (30, 2, 2, 5, 3)])
+def test_planted_components(n, m, k, parts, sep_size):
+    for seed in range(50):
+        hg = planted(n, m, k, parts, sep_size, seed)
+        assert all(len(e) == k for e in hg.edges.values())
+        sep = set(v for v in hg.V if v.startswith('s'))
+        components = [C for C in hg.separate(sep) if C.edges]
+        assert len(components) >= min(parts, m)
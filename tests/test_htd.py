@@ -0,0 +1,98 @@
+import pytest
+from hyperfun.htd import HtdSyntaxError, check_decomposition, read_htd
+from hyperfun.hypergraph import HyperGraph
+
+# path a - b - c - d, vertices numbered 1 to 4 and edges e1 to e3 as 1 to 3
+VALID = '''c path of three edges
+s htd 3 1 4 3
+b 1 1 2
+b 2 2 3
+b 3 3 4
+1 2
+2 3
+w 1 1 1
+w 2 2 1
+w 3 3 1
+'''
+
+
+def _path():
+    hg = HyperGraph()
+    hg.vt.intern_edge('abcd')  # fixes the numbering
+    for en, e in [('e1', 'ab'), ('e2', 'bc'), ('e3', 'cd')]:
+        hg.add_edge(set(e), en)
+    return hg
+
+
+def _read(tmp_path, text):
+    path = tmp_path / 'd.htd'
+    path.write_text(text)
+    return read_htd(str(path))
+
+
+def _check(tmp_path, text):
+    width, kind, checks = check_decomposition(_path(), _read(tmp_path, text))
+    failed = {name: shown for name, count, shown in checks if count}
+    return width, kind, failed
+
+
+def test_read_htd(tmp_path):
+    d = _read(tmp_path, VALID)
+    assert d.declared == (3, 1.0, 4, 3)
+    assert d.bags == {1: {1, 2}, 2: {2, 3}, 3: {3, 4}}
+    assert d.tree == [(1, 2), (2, 3)]
+    assert d.cover == {1: {1: 1.0}, 2: {2: 1.0}, 3: {3: 1.0}}
+    assert _check(tmp_path, VALID) == (1, 'HD', {})
+
+
+def test_header_line(tmp_path):
+    for header in ['s td 3 1 4 3', 's htd 3 1 4']:
+        with pytest.raises(HtdSyntaxError) as e:
+            _read(tmp_path, VALID.replace('s htd 3 1 4 3', header))
+        assert e.value.line == 2
+        assert 'expected s htd <bags> <width>' in str(e.value)
+
+
+def test_declared_counts(tmp_path):
+    text = VALID.replace('s htd 3 1 4 3', 's htd 4 1 4 2')
+    width, kind, failed = _check(tmp_path, text)
+    assert kind is None
+    assert failed == {'header': [
+        'declared 4 vertices, 2 edges, hypergraph has 4, 3',
+        'declared 4 bags, found 3']}
+
+
+def test_edge_not_covered(tmp_path):
+    width, kind, failed = _check(tmp_path, VALID.replace('b 3 3 4', 'b 3 3'))
+    assert kind is None
+    assert failed == {'edge coverage': ['edge e3 is in no bag']}
+
+
+def test_bag_not_covered(tmp_path):
+    width, kind, failed = _check(tmp_path, VALID.replace('w 2 2 1\n', ''))
+    assert kind is None
+    assert failed == {'covers': ['vertex b of bag 2 is not covered']}
+
+
+def test_connectedness(tmp_path):
+    text = VALID.replace('b 3 3 4', 'b 3 1 3 4') + 'w 3 1 1\n'
+    width, kind, failed = _check(tmp_path, text)
+    assert (width, kind) == (2, None)
+    assert failed == {'connectedness': [
+        'bags of vertex a are disconnected (1 and 3)']}
+
+
+def test_not_a_tree(tmp_path):
+    width, kind, failed = _check(tmp_path, VALID.replace('\n2 3\n', '\n'))
+    assert kind is None
+    assert failed == {'tree': ['1 tree edges for 3 bags']}
+
+    # right number of tree edges, but a cycle and a lone bag
+    text = (VALID.replace('s htd 3', 's htd 4') + 'b 4 4\n3 1\nw 4 3 1\n')
+    width, kind, failed = _check(tmp_path, text)
+    assert kind is None
+    assert failed == {'tree': ['cycle through bag 1']}
+
+    width, kind, failed = _check(tmp_path, VALID + '2 5\n')
+    assert kind is None
+    assert failed == {'tree': ['tree edge 2 5 names a missing bag']}
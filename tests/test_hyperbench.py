@@ -0,0 +1,48 @@
+import pytest
+from hyperfun.hyperbench import HyperbenchSyntaxError, parse_chunks
+from hyperfun.hypergraph import HyperGraph
+
+TEXT = ('% comment\n'
+        'e1(a,b,c),\n'
+        'e2 (c, d),e3(d,\n'
+        '  e,f),\n'
+        'e4(f,a).\n')
+
+
+def _chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_chunk_boundaries():
+    expected = list(parse_chunks([TEXT]))
+    assert [name for name, _ in expected] == ['e1', 'e2', 'e3', 'e4']
+    assert expected[2] == ('e3', ['d', 'e', 'f'])
+    for size in range(1, 12):
+        assert list(parse_chunks(_chunked(TEXT, size))) == expected
+
+
+def test_long_line_in_small_chunks():
+    text = ','.join('e{}(a{},b{})'.format(i, i, i) for i in range(20000))
+    edges = list(parse_chunks(iter(text + '.')))
+    assert len(edges) == 20000
+    assert edges[-1] == ('e19999', ['a19999', 'b19999'])
+
+
+def test_error_position_does_not_depend_on_chunks():
+    text = 'e1(a,b),\ne2(c,,d).\n'
+    for size in (1, 3, len(text)):
+        with pytest.raises(HyperbenchSyntaxError) as info:
+            list(parse_chunks(_chunked(text, size)))
+        assert (info.value.line, info.value.col) == (2, 6)
+
+
+def test_from_hyperbench(tmp_path):
+    path = str(tmp_path / 'in.hg')
+    with open(path, 'w') as f:
+        f.write('e1(b,a,b),\ne2(c, a),\ne1(a,c).\n')
+    hg = HyperGraph.fromHyperbench(path)
+    assert hg.vt.names == ['b', 'a', 'c']
+    assert hg.edges == {'e1': (1, 2), 'e2': (1, 2)}
+    assert hg.vids == {0, 1, 2}
+    assert hg.edge_dict['e1'] == {'a', 'c'}
+    assert hg.edges_touching({'b'}) == set()
@@ -0,0 +1,65 @@
+from hyperfun.main import Prompt
+from tests.helpers import random_hypergraph, run_command
+
+
+def _bridge_sets(hg, U):
+    """The special edges of bridge_subg, from separate in component order"""
+    Uids = hg.vt.lookup(U)
+    touching = [e for e in hg.edges.values() if not Uids.isdisjoint(e)]
+    sets = []
+    for C_i in hg.separate(set(U)):
+        outside = C_i.vids - Uids
+        Sp_i = set()
+        for e in touching:
+            if not outside.isdisjoint(e):
+                Sp_i.update(v for v in e if v not in Uids)
+        if Sp_i:
+            sets.append(tuple(sorted(Sp_i)))
+    return sets
+
+
+def test_bridge_subg():
+    for seed in range(50):
+        hg = random_hypergraph(seed, n=15, m=12, k=3)
+        U = sorted(hg.V)[:seed % 5 + 1]
+        C = hg.bridge_subg(set(U))
+        specials = sorted((en for en in C.edges if en.startswith('Special')),
+                          key=lambda en: int(en[len('Special'):]))
+        assert [C.edges[en] for en in specials] == _bridge_sets(hg, U)
+        Uids = hg.vt.lookup(U)
+        assert set(C.edges) - set(specials) == set(
+            en for en, e in hg.edges.items() if not Uids.isdisjoint(e))
+
+
+def _edge_lines(lines):
+    return [l for l in lines if not l.startswith('... ')]
+
+
+def test_repr_lines_limit(monkeypatch):
+    monkeypatch.setattr('hyperfun.hypergraph.COLOR', False)
+    hg = random_hypergraph(0, n=15, m=12)
+    full = list(hg.repr_lines())
+    assert len(full) == 12 and full == _edge_lines(full)
+    for limit in (0, 1, 5, 11):
+        lines = list(hg.repr_lines(limit=limit))
+        assert lines[:-1] == full[:limit]
+        assert lines[-1] == '... {} more edges'.format(12 - limit)
+    for limit in (12, 13, None):
+        assert list(hg.repr_lines(limit=limit)) == full
+
+
+def test_limit_off(monkeypatch, capsys):
+    monkeypatch.setattr('hyperfun.hypergraph.COLOR', False)
+    prompt = Prompt()
+    prompt.state.set_initial(random_hypergraph(0, n=15, m=12))
+    full = list(prompt.state.hg.repr_lines())
+
+    def show():
+        capsys.readouterr()
+        run_command(prompt, 'show')
+        return capsys.readouterr().out.splitlines()[1:]
+    run_command(prompt, 'limit 3')
+    assert show() == full[:3] + ['... 9 more edges']
+    run_command(prompt, 'limit off')
+    assert prompt.state.show_limit is None
+    assert show() == full
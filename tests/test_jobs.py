@@ -0,0 +1,30 @@
+from hyperfun.hypergraph import HyperGraph
+from hyperfun.main import INITIAL_HG_NAME, Prompt
+from hyperfun.snapshot import write_snapshot
+from tests.helpers import run_command
+
+
+def test_job_leaves_active_graph_alone():
+    prompt = Prompt()
+    prompt.state.make_grid(4, 4)
+    hg = prompt.state.hg
+    hg.edges_touching({'0.0'})  # builds the incidence index
+    index, cache = hg._incidence, list(hg.cache._data)
+    run_command(prompt, 'bg sep 1.0 1.1 1.2 1.3')
+    prompt.jobs.wait()
+    run_command(prompt, 'hist')
+    assert hg._incidence is index
+    assert list(hg.cache._data) == cache
+    assert 'C01' in prompt.state.components
+
+
+def test_background_load_gets_a_new_name(tmp_path):
+    path = str(tmp_path / 'grid.bin')
+    write_snapshot(HyperGraph.grid(2, 2), path)
+    prompt = Prompt()
+    for _ in range(3):  # all started before any is collected
+        prompt.onecmd('bg load {}'.format(path))
+    prompt.jobs.wait()
+    run_command(prompt, 'hist')
+    names = list(prompt.state.components)
+    assert len(names) == 3 and names[0] == INITIAL_HG_NAME
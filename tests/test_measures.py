@@ -0,0 +1,91 @@
+import itertools
+import pytest
+
+pytest.importorskip('scipy')
+from hyperfun.hypergraph import HyperGraph  # noqa: E402
+from hyperfun.measures import MULTI, measures  # noqa: E402
+from tests.helpers import random_hypergraph  # noqa: E402
+
+
+def _graphs():
+    yield HyperGraph()
+    for seed in range(20):
+        yield random_hypergraph(seed, n=8, m=seed % 9, k=4)
+    hg = random_hypergraph(1, n=8, m=5)
+    hg.add_edge(set(), 'empty')
+    yield hg
+    yield HyperGraph.grid(2, 3)
+
+
+def _distribution(values):
+    if not values:
+        return 0, 0.0, 0, dict()
+    hist = {v: values.count(v) for v in set(values)}
+    return min(values), sum(values) / len(values), max(values), hist
+
+
+def _components(vertices, edges):
+    """Primal components by merging vertex sets that share a vertex"""
+    comps = [{v} for v in vertices]
+    for e in edges:
+        touching = [c for c in comps if c & e]
+        comps = [c for c in comps if not c & e] + [set().union(*touching)]
+    return len([c for c in comps if c])
+
+
+def _largest_intersection(edges, c):
+    return max((len(set.intersection(*map(set, es)))
+                for es in itertools.combinations(edges, c)), default=0)
+
+
+def _vc_dimension(vertices, edges):
+    traces = [set(e) for e in edges]
+    best = 0
+    for d in range(1, len(vertices) + 1):
+        if not any(len(set(frozenset(t & set(S)) for t in traces)) == 2 ** d
+                   for S in itertools.combinations(vertices, d)):
+            break
+        best = d
+    return best if edges else 0
+
+
+def _brute_force(hg):
+    vertices = sorted(hg.vids)
+    edges = [hg.edges[en] for en in sorted(hg.edges)]
+    primal = _components(vertices, map(set, edges))
+    rows = {
+        'vertices': len(vertices),
+        'edges': len(edges),
+        'edge sizes': _distribution([len(e) for e in edges]),
+        'degrees': _distribution([sum(v in e for e in edges)
+                                  for v in vertices]),
+        'primal components': primal,
+        'incidence components': primal + sum(not e for e in edges),
+        'intersection width': _largest_intersection(edges, 2),
+    }
+    for c in MULTI:
+        rows['{}-multi-intersection width'.format(c)] = \
+            _largest_intersection(edges, c)
+    return rows, _vc_dimension(vertices, edges)
+
+
+def test_measures_match_brute_force():
+    for hg in _graphs():
+        expected, vc = _brute_force(hg)
+        rows = measures(hg, budget=60)
+        found = {name: value for name, value, exact in rows}
+        assert all(exact for name, value, exact in rows
+                   if name != 'VC dimension')
+        lower, upper = found.pop('VC dimension')
+        assert lower <= vc <= upper
+        assert found.keys() == expected.keys()
+        for name, value in expected.items():
+            assert found[name] == pytest.approx(value), name
+
+
+def test_empty_hypergraph():
+    rows = measures(HyperGraph())
+    assert [value for name, value, exact in rows] == [
+        0, 0, (0, 0.0, 0, {}), (0, 0.0, 0, {}), 0, 0, 0] + \
+        [0] * len(MULTI) + [(0, 0)]
+    assert all(exact for name, value, exact in rows)
@@ -0,0 +1,78 @@
+from hyperfun.main import Prompt
+from hyperfun.prefix import LIMIT, PrefixIndex
+from tests.helpers import random_hypergraph
+
+NAMES = ['ab', 'abc', 'abd', 'b', 'ba', 'a', 'cÿ', 'cÿz', 'd']
+
+
+def test_complete():
+    index = PrefixIndex(NAMES)
+    assert index.complete('ab') == ['ab', 'abc', 'abd']
+    assert index.complete('a') == ['a', 'ab', 'abc', 'abd']
+    assert index.complete('cÿ') == ['cÿ', 'cÿz']
+    assert index.complete('abc') == ['abc']
+    assert index.count('b') == 2
+
+
+def test_empty_prefix():
+    index = PrefixIndex(NAMES)
+    assert index.complete('') == sorted(NAMES)
+    assert index.count('') == len(index) == len(NAMES)
+    assert PrefixIndex([]).complete('') == []
+
+
+def test_no_match():
+    index = PrefixIndex(NAMES)
+    for prefix in ['x', 'abe', 'aa', 'e', 'abcd']:
+        assert index.complete(prefix) == []
+        assert index.count(prefix) == 0
+
+
+def test_limit():
+    names = ['v{}'.format(i) for i in range(LIMIT * 2)]
+    index = PrefixIndex(names)
+    cut = index.complete('v')
+    assert len(cut) == LIMIT
+    # the cut list keeps the last match for readline's common prefix
+    assert cut[-1] == max(names) and cut[:-1] == sorted(names)[:LIMIT - 1]
+    assert index.complete('v', limit=3) == ['v0', 'v1', max(names)]
+    assert index.complete('v', limit=1) == ['v0']
+    assert index.complete('v', limit=0) == []
+    assert index.complete('v', limit=None) == sorted(names)
+    assert index.complete('v1', limit=LIMIT * 2) == sorted(
+        n for n in names if n.startswith('v1'))
+
+
+def _prompt():
+    prompt = Prompt()
+    prompt.state.set_initial(random_hypergraph(2, n=12, m=12))
+    return prompt
+
+
+def test_vertex_and_edge_completion():
+    prompt = _prompt()
+    hg = prompt.state.hg
+    vertices = sorted(hg.vt.to_names(hg.vids))
+    edges = sorted(hg.edges)
+    assert prompt.complete_separate('v1', 'separate v1', 9, 11) == [
+        v for v in vertices if v.startswith('v1')]
+    assert prompt.complete_findv('', 'findv ', 6, 6) == vertices
+    assert prompt.complete_edge_subgraph('e1', 'edge_subgraph e1', 14, 16) \
+        == [e for e in edges if e.startswith('e1')]
+    assert prompt.complete_find_edge('x', 'find_edge x', 10, 11) == []
+
+    hg.add_edge({'v1', 'new'}, 'e1new')
+    assert 'new' in prompt.complete_separate('n', 'separate n', 9, 10)
+    assert 'e1new' in prompt.complete_edge_subgraph('e1', '', 0, 0)
+
+
+def test_component_completion():
+    prompt = _prompt()
+    state = prompt.state
+    state.register_subgraph(state.hg.edge_subg(['e0', 'e1']), base='sub')
+    names = list(state.components)
+    assert len(names) == 2
+    assert prompt.complete_comp('', 'comp ', 5, 5) == sorted(names)
+    assert prompt.complete_comp(names[1][:2], 'comp ', 5, 7) == [
+        n for n in sorted(names) if n.startswith(names[1][:2])]
+    assert prompt.complete_comp('zz', 'comp zz', 5, 7) == []
@@ -0,0 +1,65 @@
+from hyperfun.hypergraph import HyperGraph
+from hyperfun.main import State
+from hyperfun.reduce import reduce_hypergraph
+from hyperfun.store import ComponentStore
+from tests.helpers import named_edges, random_hypergraph
+
+
+def _collapsible():
+    # a, b, c only in e1 and x, y only in e3; e2 is subsumed by e1
+    hg = HyperGraph()
+    hg.add_edge({'a', 'b', 'c', 'd'}, 'e1')
+    hg.add_edge({'c', 'd'}, 'e2')
+    hg.add_edge({'d', 'x', 'y'}, 'e3')
+    hg.add_edge({'d', 'e'}, 'e4')
+    hg.add_edge({'e', 'x2'}, 'e5')
+    return hg
+
+
+def test_undo():
+    for seed in range(30):
+        hg = random_hypergraph(seed, n=12, m=15)
+        reduced, reduction = reduce_hypergraph(hg)
+        assert named_edges(reduction.undo(reduced)) == named_edges(hg)
+
+
+def test_undo_over_another_table():
+    hg = _collapsible()
+    reduced, reduction = reduce_hypergraph(hg)
+    copy = HyperGraph()
+    for en in reversed(sorted(reduced.edges)):
+        copy.add_edge(set(reduced.edge_dict[en]), en)
+    assert named_edges(reduction.undo(copy)) == named_edges(hg)
+
+
+def _spilling_state():
+    state = State()
+    state.components = ComponentStore(1)
+    state.set_initial(_collapsible())
+    state.switch_to_comp(state.reduce()[0])
+    for i in range(3):
+        state.components['other{}'.format(i)] = random_hypergraph(i)
+    return state
+
+
+def _check_unreduce(state):
+    V = set(state.hg.V)
+    a, = V & {'a', 'b', 'c'}
+    x, = V & {'x', 'y'}
+    assert state.unreduce_vertices({a}) == {'a', 'b', 'c'}
+    assert state.unreduce_vertices({x, 'e'}) == {'x', 'y', 'e'}
+    state.unreduce()
+    assert named_edges(state.hg) == named_edges(_collapsible())
+
+
+def test_unreduce_across_spill():
+    state = _spilling_state()
+    assert not state.components.is_resident(state.current_component)
+    _check_unreduce(state)
+
+
+def test_unreduce_after_load_session(tmp_path):
+    state = _spilling_state()
+    state.save_session(str(tmp_path))
+    loaded = State.load_session(str(tmp_path))
+    _check_unreduce(loaded)
@@ -0,0 +1,44 @@
+import os
+from hyperfun.hypergraph import HyperGraph
+from hyperfun.snapshot import is_snapshot, read_snapshot, write_snapshot
+from tests.helpers import named_edges, random_hypergraph
+
+
+def test_round_trip(tmp_path):
+    for seed in range(20):
+        hg = random_hypergraph(seed)
+        path = str(tmp_path / 'hg.bin')
+        write_snapshot(hg, path)
+        assert is_snapshot(path)
+        loaded = read_snapshot(path)
+        assert named_edges(loaded) == named_edges(hg)
+        assert set(loaded.V) == set(hg.V)
+
+
+def test_derived_graph_round_trip(tmp_path):
+    hg = random_hypergraph(1, n=20, m=15)
+    sub = hg.edge_subg(sorted(hg.edges)[5:])
+    path = str(tmp_path / 'sub.bin')
+    write_snapshot(sub, path)
+    assert named_edges(read_snapshot(path)) == named_edges(sub)
+
+
+def test_empty(tmp_path):
+    path = str(tmp_path / 'empty.bin')
+    write_snapshot(HyperGraph(), path)
+    loaded = read_snapshot(path)
+    assert len(loaded.edges) == 0 and len(loaded.vids) == 0
+
+
+def test_overwriting_a_loaded_snapshot(tmp_path):
+    path = str(tmp_path / 'hg.bin')
+    big = random_hypergraph(2, n=30, m=40)
+    write_snapshot(big, path)
+    loaded = read_snapshot(path)
+    names, indptr, indices = loaded.csr()
+    before = (list(indptr), list(indices))
+    write_snapshot(HyperGraph.grid(2, 2), path)
+    names, indptr, indices = loaded.csr()
+    assert (list(indptr), list(indices)) == before
+    assert named_edges(loaded) == named_edges(big)
+    assert os.listdir(str(tmp_path)) == ['hg.bin']
@@ -0,0 +1,106 @@
+import os
+from hyperfun.main import State
+from hyperfun.store import ComponentStore
+from tests.helpers import named_edges, random_hypergraph
+
+
+def _filled_store(resident=2):
+    hg = random_hypergraph(3, n=30, m=20)
+    store = ComponentStore(resident)
+    parts = {'all': hg}
+    names = sorted(hg.edges)
+    for i in range(5):
+        parts['part{}'.format(i)] = hg.edge_subg(names[i::5])
+    for name, part in parts.items():
+        store[name] = part
+    return store, hg, parts
+
+
+def test_reload_keeps_vertex_table():
+    store, hg, parts = _filled_store()
+    assert not store.is_resident('all')
+    for name, part in parts.items():
+        loaded = store[name]
+        assert loaded.vt is hg.vt
+        assert dict(loaded.edges.items()) == dict(part.edges.items())
+        assert loaded.vids == part.vids
+    assert store.disk_usage()[0] == len(parts) - 2
+
+
+def test_mutation_after_reload_is_written_again():
+    store, hg, parts = _filled_store()
+    part = store['part0']
+    part.add_edge({'v0', 'new'}, 'extra')
+    for name in parts:
+        store[name]
+    assert not store.is_resident('part0')
+    reloaded = store['part0']
+    assert reloaded.vt.to_names(reloaded.edges['extra']) == {'v0', 'new'}
+    assert store.summary('part0') == part.summary()
+
+
+def test_session_round_trip(tmp_path):
+    store, hg, parts = _filled_store()
+    store.save(str(tmp_path), {'current': 'all'})
+    loaded, extra = ComponentStore.load(str(tmp_path), resident=2)
+    assert extra['current'] == 'all'
+    assert list(loaded) == list(parts)
+    graphs = [loaded[name] for name in parts]
+    for g, part in zip(graphs, parts.values()):
+        assert named_edges(g) == named_edges(part)
+    assert len(set(id(g.vt) for g in graphs)) == 1
+
+
+def test_state_hg_is_never_evicted():
+    state = State()
+    state.components = ComponentStore(1)
+    state.set_initial(random_hypergraph(4))
+    name, _ = state.register_subgraph(state.hg.edge_subg(['e0', 'e1']),
+                                      base='x')
+    assert not state.components.is_resident(state.current_component)
+    state.hg.add_edge({'v1', 'v2'}, 'added')
+    state.components[name]
+    assert 'added' in state.components[state.current_component].edges
+
+
+def test_memory_usage():
+    state = State()
+    state.set_initial(random_hypergraph(5, n=20, m=20))
+    names = sorted(state.hg.edges)
+    state.register_subgraph(state.hg.edge_subg(names[:10]), base='x')
+    alone = random_hypergraph(6)
+    state.components['alone'] = alone
+    usage, total = state.memory_usage()
+    by_name = {name: (own, shared) for name, own, shared in usage}
+    assert set(by_name) == set(state.components)
+    assert by_name['alone'][1] == 0 and by_name['alone'][0] > 0
+    assert by_name['init'][1] > 0
+    assert total >= sum(own for own, _ in by_name.values())
+
+
+def _spill_files(store):
+    return sorted(os.listdir(store._spill_dir))
+
+
+def test_overwriting_a_spilled_component_removes_its_file():
+    store, hg, parts = _filled_store()
+    assert not store.is_resident('all')
+    old = os.path.basename(store._paths['all'])
+    store['all'] = random_hypergraph(7)
+    for name in parts:  # evicts the new 'all' again
+        store[name]
+    files = _spill_files(store)
+    assert old not in files
+    assert files == sorted(os.path.basename(p)
+                           for p in store._paths.values())
+    assert named_edges(store['all']) == named_edges(random_hypergraph(7))
+
+
+def test_loaded_session_files_stay(tmp_path):
+    store, hg, parts = _filled_store()
+    store.save(str(tmp_path), {})
+    loaded, _ = ComponentStore.load(str(tmp_path), resident=2)
+    saved = sorted(os.listdir(str(tmp_path)))
+    loaded['all'] = random_hypergraph(7)
+    del loaded['part0']
+    assert sorted(os.listdir(str(tmp_path))) == saved
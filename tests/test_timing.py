@@ -0,0 +1,21 @@
+import tracemalloc
+from hyperfun.main import Prompt
+from tests.helpers import run_command
+
+
+def test_peak_is_per_command():
+    prompt = Prompt()
+    prompt.state.timing = True
+    tracemalloc.start()
+    try:
+        big = [object() for _ in range(100000)]
+        del big
+        run_command(prompt, 'grid 3 3')
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    run_command(prompt, 'show')
+    assert not tracemalloc.is_tracing()
+    (_, _, grid_peak), (_, _, show_peak) = prompt.state.timings
+    assert 0 < grid_peak < 1 << 20
+    assert 0 < show_peak < 1 << 20
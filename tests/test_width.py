@@ -0,0 +1,57 @@
+import random
+from hyperfun.htd import check_decomposition
+from hyperfun.width import (decomposition, degeneracy, eliminate,
+                            primal_adjacency, width_bounds)
+from tests.helpers import random_acyclic, random_hypergraph
+
+
+def _graphs():
+    for seed in range(30):
+        yield random_hypergraph(seed, n=12, m=seed % 10 + 1, k=4)
+
+
+def _heuristics(hg):
+    """(min_fill, rng) of every elimination heuristic width_bounds runs"""
+    for min_fill in (False, True):
+        yield min_fill, None
+        yield min_fill, random.Random(min_fill)
+
+
+def _check(hg, d, tw, ghw):
+    width, kind, checks = check_decomposition(hg, d)
+    assert kind in ('HD', 'GHD'), checks
+    assert width == ghw == d.declared[1]
+    assert max(len(bag) for bag in d.bags.values()) - 1 == tw
+
+
+def test_heuristics_give_valid_decompositions():
+    for hg in _graphs():
+        adj = primal_adjacency(hg)
+        for min_fill, rng in _heuristics(hg):
+            tw, order, neighbours = eliminate(
+                {v: set(nb) for v, nb in adj.items()}, min_fill, rng=rng)
+            assert sorted(order) == sorted(hg.vids)
+            assert tw >= degeneracy(adj)
+            d = decomposition(hg, order, neighbours)
+            _check(hg, d, tw, d.width())
+
+
+def test_width_bounds_improve():
+    for hg in _graphs():
+        results = list(width_bounds(hg, budget=60))
+        assert results[0][0] == 'single bag'
+        for name, tw, ghw, d in results:
+            _check(hg, d, tw, ghw)
+        for (_, tw0, ghw0, _), (_, tw1, ghw1, _) in zip(results, results[1:]):
+            assert tw1 < tw0 or ghw1 < ghw0
+
+
+def test_acyclic_has_width_1():
+    for seed in range(30):
+        hg = random_acyclic(seed)
+        # the primal graph is chordal, min-fill finds a perfect ordering
+        adj = primal_adjacency(hg)
+        tw, order, neighbours = eliminate(adj, min_fill=True)
+        d = decomposition(hg, order, neighbours)
+        _check(hg, d, tw, 1)
+        assert min(ghw for _, _, ghw, _ in width_bounds(hg, budget=60)) == 1